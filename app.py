@@ -1,12 +1,334 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                            QLineEdit, QPushButton, QTextEdit, QLabel, QComboBox,
-                           QMessageBox, QFileDialog, QFrame)
+                           QFileDialog, QFrame, QCheckBox, QSpinBox)
 from PyQt6.QtCore import QSettings, Qt, QTimer, QSize
 from PyQt6.QtGui import QPainter, QColor, QPen
-from theme import ThemeWindow
-from scraper import ScraperThread
+from theme import ThemeWindow, theme_stylesheet
+from boilerplate import BoilerplateFilter
+from profiles import ProfileStore, PROFILE_PREFIX
+from profile_window import ProfileWindow
 import os
 import math
+import threading
+from urllib.parse import urlsplit
+
+# Per-theme rules for the main window and its sidebar. The sidebar rules are
+# scoped with #sidebar so the whole theme is one stylesheet and one re-polish.
+BASE_STYLES = """
+    QWidget {
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+    QMainWindow {
+        border: none;
+    }
+    QPushButton {
+        border: none;
+        border-radius: 5px;
+        padding: 8px 15px;
+        font-weight: bold;
+        min-width: 80px;
+    }
+    QLineEdit, QComboBox, QTextEdit {
+        border-radius: 5px;
+        padding: 8px;
+        selection-background-color: #0078d4;
+        selection-color: white;
+    }
+    QComboBox::drop-down {
+        border: none;
+        width: 20px;
+    }
+    QComboBox::down-arrow {
+        width: 12px;
+        height: 12px;
+    }
+    QScrollBar:vertical {
+        border: none;
+        width: 12px;
+        margin: 15px 0 15px 0;
+    }
+    QScrollBar::handle:vertical {
+        border-radius: 6px;
+        min-height: 30px;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        border: none;
+        background: none;
+    }
+"""
+
+THEME_STYLES = {
+    "Light": ("""
+        QMainWindow, QWidget {
+            background-color: #ffffff;
+            color: #333333;
+        }
+        QLineEdit, QComboBox, QTextEdit {
+            background-color: white;
+            border: 1px solid #dddddd;
+            color: #333333;
+        }
+        QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
+            border: 2px solid #0078d4;
+        }
+        QPushButton {
+            background-color: #0078d4;
+            color: white;
+        }
+        QPushButton:hover {
+            background-color: #1084d8;
+        }
+        QPushButton:pressed {
+            background-color: #006cbd;
+        }
+        QScrollBar:vertical {
+            background-color: #f5f5f5;
+        }
+        QScrollBar::handle:vertical {
+            background-color: #dddddd;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: #c1c1c1;
+        }
+        QComboBox {
+            background-color: white;
+        }
+        QComboBox:hover {
+            border: 1px solid #0078d4;
+        }
+        QComboBox::drop-down {
+            background-color: #dddddd;
+        }
+    """, """
+        QWidget#sidebar, #sidebar QWidget {
+            background-color: #f0f0f0;
+            color: #333333;
+        }
+        #sidebar QPushButton {
+            background-color: #e0e0e0;
+            color: #333333;
+        }
+        #sidebar QPushButton:hover {
+            background-color: #d0d0d0;
+        }
+    """),
+    "Dark": ("""
+        QMainWindow, QWidget {
+            background-color: #1a1a1a;
+            color: #ffffff;
+        }
+        QLineEdit, QComboBox, QTextEdit {
+            background-color: #2d2d2d;
+            border: 1px solid #404040;
+            color: #ffffff;
+        }
+        QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
+            border: 2px solid #0078d4;
+        }
+        QPushButton {
+            background-color: #0078d4;
+            color: white;
+        }
+        QPushButton:hover {
+            background-color: #1084d8;
+        }
+        QPushButton:pressed {
+            background-color: #006cbd;
+        }
+        QScrollBar:vertical {
+            background-color: #2d2d2d;
+        }
+        QScrollBar::handle:vertical {
+            background-color: #404040;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: #4d4d4d;
+        }
+        QComboBox {
+            background-color: #2d2d2d;
+        }
+        QComboBox:hover {
+            border: 1px solid #0078d4;
+        }
+        QComboBox::drop-down {
+            background-color: #404040;
+        }
+    """, """
+        QWidget#sidebar, #sidebar QWidget {
+            background-color: #2d2d2d;
+            color: #ffffff;
+        }
+        #sidebar QPushButton {
+            background-color: #3b3b3b;
+            color: #ffffff;
+        }
+        #sidebar QPushButton:hover {
+            background-color: #4b4b4b;
+        }
+    """),
+    "Nord": ("""
+        QMainWindow, QWidget {
+            background-color: #2e3440;
+            color: #eceff4;
+        }
+        QLineEdit, QComboBox, QTextEdit {
+            background-color: #3b4252;
+            border: 1px solid #4c566a;
+            color: #eceff4;
+        }
+        QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
+            border: 2px solid #0078d4;
+        }
+        QPushButton {
+            background-color: #0078d4;
+            color: white;
+        }
+        QPushButton:hover {
+            background-color: #1084d8;
+        }
+        QPushButton:pressed {
+            background-color: #006cbd;
+        }
+        QScrollBar:vertical {
+            background-color: #3b4252;
+        }
+        QScrollBar::handle:vertical {
+            background-color: #4c566a;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: #5c6bc0;
+        }
+        QComboBox {
+            background-color: #3b4252;
+        }
+        QComboBox:hover {
+            border: 1px solid #0078d4;
+        }
+        QComboBox::drop-down {
+            background-color: #4c566a;
+        }
+    """, """
+        QWidget#sidebar, #sidebar QWidget {
+            background-color: #3b4252;
+            color: #eceff4;
+        }
+        #sidebar QPushButton {
+            background-color: #434c5e;
+            color: #eceff4;
+        }
+        #sidebar QPushButton:hover {
+            background-color: #4c566a;
+        }
+    """),
+    "Solarized": ("""
+        QMainWindow, QWidget {
+            background-color: #002b36;
+            color: #839496;
+        }
+        QLineEdit, QComboBox, QTextEdit {
+            background-color: #073642;
+            border: 1px solid #586e75;
+            color: #839496;
+        }
+        QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
+            border: 2px solid #0078d4;
+        }
+        QPushButton {
+            background-color: #0078d4;
+            color: white;
+        }
+        QPushButton:hover {
+            background-color: #1084d8;
+        }
+        QPushButton:pressed {
+            background-color: #006cbd;
+        }
+        QScrollBar:vertical {
+            background-color: #073642;
+        }
+        QScrollBar::handle:vertical {
+            background-color: #586e75;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: #65737e;
+        }
+        QComboBox {
+            background-color: #073642;
+        }
+        QComboBox:hover {
+            border: 1px solid #0078d4;
+        }
+        QComboBox::drop-down {
+            background-color: #586e75;
+        }
+    """, """
+        QWidget#sidebar, #sidebar QWidget {
+            background-color: #073642;
+            color: #839496;
+        }
+        #sidebar QPushButton {
+            background-color: #094856;
+            color: #839496;
+        }
+        #sidebar QPushButton:hover {
+            background-color: #586e75;
+        }
+    """),
+    "Dracula": ("""
+        QMainWindow, QWidget {
+            background-color: #282a36;
+            color: #f8f8f2;
+        }
+        QLineEdit, QComboBox, QTextEdit {
+            background-color: #3b3b4d;
+            border: 1px solid #44475a;
+            color: #f8f8f2;
+        }
+        QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
+            border: 2px solid #0078d4;
+        }
+        QPushButton {
+            background-color: #0078d4;
+            color: white;
+        }
+        QPushButton:hover {
+            background-color: #1084d8;
+        }
+        QPushButton:pressed {
+            background-color: #006cbd;
+        }
+        QScrollBar:vertical {
+            background-color: #3b3b4d;
+        }
+        QScrollBar::handle:vertical {
+            background-color: #44475a;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: #5c6bc0;
+        }
+        QComboBox {
+            background-color: #3b3b4d;
+        }
+        QComboBox:hover {
+            border: 1px solid #0078d4;
+        }
+        QComboBox::drop-down {
+            background-color: #44475a;
+        }
+    """, """
+        QWidget#sidebar, #sidebar QWidget {
+            background-color: #44475a;
+            color: #f8f8f2;
+        }
+        #sidebar QPushButton {
+            background-color: #4a4d64;
+            color: #f8f8f2;
+        }
+        #sidebar QPushButton:hover {
+            background-color: #6272a4;
+        }
+    """),
+}
 
 class LoadingSpinner(QWidget):
     def __init__(self, parent=None, centerOnParent=True, disableParentWhenSpinning=True):
@@ -95,15 +417,31 @@ class WebScraperApp(QMainWindow):
         self.theme_window = None
         self.about_window = None
         self.help_window = None
+        self.profile_window = None
+        self.gallery_window = None
+        self.current_theme = None
         self.settings = QSettings('ScrapApp', 'WebScraper')
         self.current_image_data = None
         self.current_image_url = None
+        # Network, parsing and storage modules are imported on first use
+        # (see get_fetcher and friends) so the window appears sooner
+        self.change_tracker = None
+        self.results_store = None
+        self.fetcher = None
+        self.store_error = None
+        self.fetcher_lock = threading.Lock()  # the prewarm thread may get here first
+        self.profile_store = ProfileStore()
+        self.boilerplate_filter = BoilerplateFilter()
+        self.warc_writer = None
+        self.replay_fetcher = None
+        self.stop_metrics_dump = None
         
         # Create loading spinner
         self.loading_spinner = LoadingSpinner(self)
         
         self.setup_ui()
         self.apply_theme(self.settings.value('theme', 'Light'))
+        self.start_metrics()
 
     def setup_ui(self):
         # Create main widget and layout
@@ -112,6 +450,7 @@ class WebScraperApp(QMainWindow):
         
         # Create and setup sidebar
         self.sidebar = QWidget()
+        self.sidebar.setObjectName("sidebar")
         self.sidebar.setMaximumWidth(200)
         self.sidebar.setMinimumWidth(200)
         sidebar_layout = QVBoxLayout()
@@ -119,12 +458,15 @@ class WebScraperApp(QMainWindow):
         # Add buttons to sidebar
         theme_btn = QPushButton("🎨 Themes")
         theme_btn.clicked.connect(self.open_theme_window)
+        profiles_btn = QPushButton("🧩 Profiles")
+        profiles_btn.clicked.connect(self.open_profile_window)
         help_btn = QPushButton("❓ Help")
         help_btn.clicked.connect(self.show_help)
         about_btn = QPushButton("About")
         about_btn.clicked.connect(self.show_about)
         
         sidebar_layout.addWidget(theme_btn)
+        sidebar_layout.addWidget(profiles_btn)
         sidebar_layout.addWidget(help_btn)
         sidebar_layout.addWidget(about_btn)
         sidebar_layout.addStretch()  
@@ -138,22 +480,93 @@ class WebScraperApp(QMainWindow):
         url_layout = QHBoxLayout()
         self.url_input = QLineEdit()
         self.url_input.setPlaceholderText("Enter URL to scrape")
+        # Warm up DNS and the connection once the host part stops changing
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.setSingleShot(True)
+        self.prewarm_timer.setInterval(600)
+        self.prewarm_timer.timeout.connect(self.prewarm_host)
+        self.prewarmed_origin = None
+        self.url_input.textChanged.connect(lambda _: self.prewarm_timer.start())
         url_layout.addWidget(QLabel("URL:"))
         url_layout.addWidget(self.url_input)
         
         self.data_type_combo = QComboBox()
-        self.data_type_combo.addItems(["Headings", "Links", "Text Content", "Images"])
+        self.data_type_combo.setMinimumWidth(150)
+        self.refresh_profiles()
         url_layout.addWidget(self.data_type_combo)
         
+        self.changes_only_check = QCheckBox("Only changes")
+        self.changes_only_check.setToolTip("Report only what was added, removed or changed since the last scrape of this URL")
+        self.changes_only_check.setChecked(self.settings.value('changes_only', False, type=bool))
+        self.changes_only_check.toggled.connect(lambda checked: self.settings.setValue('changes_only', checked))
+        url_layout.addWidget(self.changes_only_check)
+        
+        self.check_links_check = QCheckBox("Check links")
+        self.check_links_check.setToolTip("In Links mode, probe every link and report status, redirect and latency")
+        self.check_links_check.setChecked(self.settings.value('check_links', False, type=bool))
+        self.check_links_check.toggled.connect(lambda checked: self.settings.setValue('check_links', checked))
+        url_layout.addWidget(self.check_links_check)
+        
         self.scrape_button = QPushButton("Scrape Website")
         self.scrape_button.clicked.connect(self.start_scraping)
         url_layout.addWidget(self.scrape_button)
         
+        pagination_layout = QHBoxLayout()
+        self.paginate_check = QCheckBox("Follow next pages")
+        self.paginate_check.setChecked(self.settings.value('paginate', False, type=bool))
+        self.paginate_check.toggled.connect(lambda checked: self.settings.setValue('paginate', checked))
+        self.max_pages_spin = QSpinBox()
+        self.max_pages_spin.setRange(1, 1000)
+        self.max_pages_spin.setPrefix("Max pages: ")
+        self.max_pages_spin.setValue(self.settings.value('max_pages', 10, type=int))
+        self.max_pages_spin.valueChanged.connect(lambda value: self.settings.setValue('max_pages', value))
+        self.next_page_input = QLineEdit()
+        self.next_page_input.setPlaceholderText("Next link: rel=next by default, or a CSS selector, or a URL template with {page}")
+        self.next_page_input.setText(self.settings.value('next_page', '', type=str))
+        self.next_page_input.textChanged.connect(lambda text: self.settings.setValue('next_page', text))
+        pagination_layout.addWidget(self.paginate_check)
+        pagination_layout.addWidget(self.max_pages_spin)
+        pagination_layout.addWidget(self.next_page_input)
+        self.boilerplate_check = QCheckBox("Drop boilerplate")
+        self.boilerplate_check.setToolTip("In Text Content mode, drop paragraphs repeated across most pages of the same site")
+        self.boilerplate_check.setChecked(self.settings.value('drop_boilerplate', False, type=bool))
+        self.boilerplate_check.toggled.connect(lambda checked: self.settings.setValue('drop_boilerplate', checked))
+        pagination_layout.addWidget(self.boilerplate_check)
+        
+        archive_layout = QHBoxLayout()
+        self.archive_combo = QComboBox()
+        self.archive_combo.addItems(["Live", "Record to WARC", "Replay from WARC"])
+        self.archive_combo.setCurrentText(self.settings.value('archive_mode', 'Live', type=str))
+        self.archive_combo.currentTextChanged.connect(lambda mode: self.settings.setValue('archive_mode', mode))
+        self.archive_path_input = QLineEdit()
+        self.archive_path_input.setPlaceholderText("WARC file (.warc.gz)")
+        self.archive_path_input.setText(self.settings.value('archive_path', '', type=str))
+        self.archive_path_input.textChanged.connect(lambda text: self.settings.setValue('archive_path', text))
+        archive_browse = QPushButton("Browse...")
+        archive_browse.clicked.connect(self.browse_archive)
+        archive_layout.addWidget(QLabel("Archive:"))
+        archive_layout.addWidget(self.archive_combo)
+        archive_layout.addWidget(self.archive_path_input)
+        archive_layout.addWidget(archive_browse)
+        
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search headings and text across past scrapes")
+        self.search_input.returnPressed.connect(self.search_history)
+        search_button = QPushButton("Search")
+        search_button.clicked.connect(self.search_history)
+        search_layout.addWidget(QLabel("History:"))
+        search_layout.addWidget(self.search_input)
+        search_layout.addWidget(search_button)
+        
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
         self.results_text.setPlaceholderText("Scraped data will appear here...")
         
         content_layout.addLayout(url_layout)
+        content_layout.addLayout(pagination_layout)
+        content_layout.addLayout(archive_layout)
+        content_layout.addLayout(search_layout)
         content_layout.addWidget(self.results_text)
         content_widget.setLayout(content_layout)
         
@@ -164,335 +577,128 @@ class WebScraperApp(QMainWindow):
         main_widget.setLayout(main_layout)
         self.setCentralWidget(main_widget)
 
+    def start_metrics(self):
+        # Opt-in via settings: metrics_port serves /metrics on localhost,
+        # metrics_file is rewritten every metrics_interval seconds
+        port = self.settings.value('metrics_port', 0, type=int)
+        path = self.settings.value('metrics_file', '', type=str)
+        if not port and not path:
+            return
+        
+        import metrics
+        try:
+            if port:
+                self.metrics_server = metrics.start_http_server(port)
+            if path:
+                self.stop_metrics_dump = metrics.start_file_dump(path, self.settings.value('metrics_interval', 15, type=int))
+        except OSError as e:
+            self.results_text.setPlainText(f"Metrics export unavailable: {str(e)}")
+
+    def closeEvent(self, event):
+        # Write the final metrics dump instead of leaving the thread to die mid-write
+        if self.stop_metrics_dump:
+            self.stop_metrics_dump()
+            self.stop_metrics_dump = None
+        super().closeEvent(event)
+
+    def get_fetcher(self):
+        with self.fetcher_lock:
+            if self.fetcher is None:
+                from fetcher import Fetcher
+                self.fetcher = Fetcher()
+            return self.fetcher
+
+    def get_results_store(self):
+        if self.results_store is None:
+            from results_store import ResultsStore
+            self.results_store = ResultsStore()
+        return self.results_store
+
+    def get_change_tracker(self):
+        if self.change_tracker is None:
+            from change_tracker import ChangeTracker
+            self.change_tracker = ChangeTracker()
+        return self.change_tracker
+
     def open_theme_window(self):
         if not self.theme_window:
             self.theme_window = ThemeWindow(self)
         self.theme_window.show()
 
+    def open_profile_window(self):
+        if not self.profile_window:
+            self.profile_window = ProfileWindow(self)
+        self.profile_window.show()
+
+    def refresh_profiles(self):
+        current = self.data_type_combo.currentText()
+        self.data_type_combo.clear()
+        self.data_type_combo.addItems(["Headings", "Links", "Text Content", "Images"])
+        self.data_type_combo.addItems([PROFILE_PREFIX + name for name in self.profile_store.names()])
+        if self.data_type_combo.findText(current) >= 0:
+            self.data_type_combo.setCurrentText(current)
+
     def apply_theme(self, theme):
-        base_styles = """
-            QWidget {
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            QMainWindow {
-                border: none;
-            }
-            QPushButton {
-                border: none;
-                border-radius: 5px;
-                padding: 8px 15px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-            QLineEdit, QComboBox, QTextEdit {
-                border-radius: 5px;
-                padding: 8px;
-                selection-background-color: #0078d4;
-                selection-color: white;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                width: 12px;
-                height: 12px;
-            }
-            QScrollBar:vertical {
-                border: none;
-                width: 12px;
-                margin: 15px 0 15px 0;
-            }
-            QScrollBar::handle:vertical {
-                border-radius: 6px;
-                min-height: 30px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-            }
-        """
+        if theme == self.current_theme:
+            return  # re-applying the same sheet would re-polish every widget
+        self.current_theme = theme
+        self.setStyleSheet(theme_stylesheet(theme, BASE_STYLES, THEME_STYLES))
 
-        if theme == "Dark":
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #1a1a1a;
-                    color: #ffffff;
-                }
-                QLineEdit, QComboBox, QTextEdit {
-                    background-color: #2d2d2d;
-                    border: 1px solid #404040;
-                    color: #ffffff;
-                }
-                QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
-                    border: 2px solid #0078d4;
-                }
-                QPushButton {
-                    background-color: #0078d4;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #1084d8;
-                }
-                QPushButton:pressed {
-                    background-color: #006cbd;
-                }
-                QScrollBar:vertical {
-                    background-color: #2d2d2d;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: #404040;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background-color: #4d4d4d;
-                }
-                QComboBox {
-                    background-color: #2d2d2d;
-                }
-                QComboBox:hover {
-                    border: 1px solid #0078d4;
-                }
-                QComboBox::drop-down {
-                    background-color: #404040;
-                }
-            """)
-            self.sidebar.setStyleSheet("""
-                QWidget {
-                    background-color: #2d2d2d;
-                    color: #ffffff;
-                }
-                QPushButton {
-                    background-color: #3b3b3b;
-                    color: #ffffff;
-                }
-                QPushButton:hover {
-                    background-color: #4b4b4b;
-                }
-            """)
-        elif theme == "Nord":
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #2e3440;
-                    color: #eceff4;
-                }
-                QLineEdit, QComboBox, QTextEdit {
-                    background-color: #3b4252;
-                    border: 1px solid #4c566a;
-                    color: #eceff4;
-                }
-                QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
-                    border: 2px solid #0078d4;
-                }
-                QPushButton {
-                    background-color: #0078d4;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #1084d8;
-                }
-                QPushButton:pressed {
-                    background-color: #006cbd;
-                }
-                QScrollBar:vertical {
-                    background-color: #3b4252;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: #4c566a;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background-color: #5c6bc0;
-                }
-                QComboBox {
-                    background-color: #3b4252;
-                }
-                QComboBox:hover {
-                    border: 1px solid #0078d4;
-                }
-                QComboBox::drop-down {
-                    background-color: #4c566a;
-                }
-            """)
-            self.sidebar.setStyleSheet("""
-                QWidget {
-                    background-color: #3b4252;
-                    color: #eceff4;
-                }
-                QPushButton {
-                    background-color: #434c5e;
-                    color: #eceff4;
-                }
-                QPushButton:hover {
-                    background-color: #4c566a;
-                }
-            """)
-        elif theme == "Solarized":
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #002b36;
-                    color: #839496;
-                }
-                QLineEdit, QComboBox, QTextEdit {
-                    background-color: #073642;
-                    border: 1px solid #586e75;
-                    color: #839496;
-                }
-                QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
-                    border: 2px solid #0078d4;
-                }
-                QPushButton {
-                    background-color: #0078d4;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #1084d8;
-                }
-                QPushButton:pressed {
-                    background-color: #006cbd;
-                }
-                QScrollBar:vertical {
-                    background-color: #073642;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: #586e75;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background-color: #65737e;
-                }
-                QComboBox {
-                    background-color: #073642;
-                }
-                QComboBox:hover {
-                    border: 1px solid #0078d4;
-                }
-                QComboBox::drop-down {
-                    background-color: #586e75;
-                }
-            """)
-            self.sidebar.setStyleSheet("""
-                QWidget {
-                    background-color: #073642;
-                    color: #839496;
-                }
-                QPushButton {
-                    background-color: #094856;
-                    color: #839496;
-                }
-                QPushButton:hover {
-                    background-color: #586e75;
-                }
-            """)
-        elif theme == "Dracula":
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #282a36;
-                    color: #f8f8f2;
-                }
-                QLineEdit, QComboBox, QTextEdit {
-                    background-color: #3b3b4d;
-                    border: 1px solid #44475a;
-                    color: #f8f8f2;
-                }
-                QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
-                    border: 2px solid #0078d4;
-                }
-                QPushButton {
-                    background-color: #0078d4;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #1084d8;
-                }
-                QPushButton:pressed {
-                    background-color: #006cbd;
-                }
-                QScrollBar:vertical {
-                    background-color: #3b3b4d;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: #44475a;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background-color: #5c6bc0;
-                }
-                QComboBox {
-                    background-color: #3b3b4d;
-                }
-                QComboBox:hover {
-                    border: 1px solid #0078d4;
-                }
-                QComboBox::drop-down {
-                    background-color: #44475a;
-                }
-            """)
-            self.sidebar.setStyleSheet("""
-                QWidget {
-                    background-color: #44475a;
-                    color: #f8f8f2;
-                }
-                QPushButton {
-                    background-color: #4a4d64;
-                    color: #f8f8f2;
-                }
-                QPushButton:hover {
-                    background-color: #6272a4;
-                }
-            """)
-        else:  # Light
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #ffffff;
-                    color: #333333;
-                }
-                QLineEdit, QComboBox, QTextEdit {
-                    background-color: white;
-                    border: 1px solid #dddddd;
-                    color: #333333;
-                }
-                QLineEdit:focus, QComboBox:focus, QTextEdit:focus {
-                    border: 2px solid #0078d4;
-                }
-                QPushButton {
-                    background-color: #0078d4;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #1084d8;
-                }
-                QPushButton:pressed {
-                    background-color: #006cbd;
-                }
-                QScrollBar:vertical {
-                    background-color: #f5f5f5;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: #dddddd;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background-color: #c1c1c1;
-                }
-                QComboBox {
-                    background-color: white;
-                }
-                QComboBox:hover {
-                    border: 1px solid #0078d4;
-                }
-                QComboBox::drop-down {
-                    background-color: #dddddd;
-                }
-            """)
-            self.sidebar.setStyleSheet("""
-                QWidget {
-                    background-color: #f0f0f0;
-                    color: #333333;
-                }
-                QPushButton {
-                    background-color: #e0e0e0;
-                    color: #333333;
-                }
-                QPushButton:hover {
-                    background-color: #d0d0d0;
-                }
-            """)
+    def prewarm_host(self):
+        if self.archive_combo.currentText() == "Replay from WARC":
+            return  # replay never touches the network
+        url = self.url_input.text().strip()
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        try:
+            parts = urlsplit(url)
+            host = parts.hostname
+        except ValueError:
+            return
+        if not host or '.' not in host:
+            return
+        origin = f"{parts.scheme}://{parts.netloc}/"
+        if origin == self.prewarmed_origin:
+            return
+        self.prewarmed_origin = origin
+        # The fetcher (and requests with it) is loaded on the worker thread too
+        threading.Thread(target=lambda: self.get_fetcher().prewarm(origin), daemon=True).start()
+
+    def browse_archive(self):
+        if self.archive_combo.currentText() == "Replay from WARC":
+            path, _ = QFileDialog.getOpenFileName(self, "Open WARC Archive", "", "WARC files (*.warc.gz *.warc);;All files (*)")
+        else:
+            path, _ = QFileDialog.getSaveFileName(self, "Record to WARC Archive", "scrape.warc.gz",
+                                                  "WARC files (*.warc.gz)",
+                                                  options=QFileDialog.Option.DontConfirmOverwrite)
+        if path:
+            self.archive_path_input.setText(path)
+
+    def archive_setup(self):
+        # Returns the (fetcher, recorder) pair for the selected archive mode
+        mode = self.archive_combo.currentText()
+        path = self.archive_path_input.text().strip()
+        if mode == "Live":
+            return self.get_fetcher(), None
+        if not path:
+            raise ValueError("Choose a WARC file to record to or replay from")
+        
+        from warc import WarcWriter, WarcArchive, ReplayFetcher
+        if mode == "Record to WARC":
+            if not self.warc_writer or self.warc_writer.path != path:
+                if self.warc_writer:
+                    self.warc_writer.close()
+                self.warc_writer = WarcWriter(path)
+            return self.get_fetcher(), self.warc_writer
+        
+        # Reopen when the archive changed on disk (e.g. more was recorded)
+        stamp = (path, os.path.getmtime(path))
+        if not self.replay_fetcher or self.replay_stamp != stamp:
+            if self.replay_fetcher:
+                self.replay_fetcher.archive.close()
+            self.replay_fetcher = ReplayFetcher(WarcArchive(path))
+            self.replay_stamp = stamp
+        return self.replay_fetcher, None
 
     def start_scraping(self):
         url = self.url_input.text().strip()
@@ -501,6 +707,20 @@ class WebScraperApp(QMainWindow):
         
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
+        
+        try:
+            fetcher, recorder = self.archive_setup()
+        except (OSError, ValueError) as e:
+            self.results_text.setPlainText(f"Error: {str(e)}")
+            return
+        
+        # History is optional; a broken database shouldn't stop the scrape
+        results_store = None
+        self.store_error = None
+        try:
+            results_store = self.get_results_store()
+        except Exception as e:
+            self.store_error = str(e)
             
         self.scrape_button.setEnabled(False)
         self.results_text.clear()
@@ -510,16 +730,42 @@ class WebScraperApp(QMainWindow):
         self.loading_spinner.start()
         
         data_type = self.data_type_combo.currentText()
-        self.scraper_thread = ScraperThread(url, data_type)
+        profile = None
+        if data_type.startswith(PROFILE_PREFIX):
+            profile = self.profile_store.get(data_type[len(PROFILE_PREFIX):])
+        next_page = self.next_page_input.text().strip()
+        page_template = next_page if '{page}' in next_page else None
+        next_selector = next_page if next_page and not page_template else None
+        change_tracker = self.get_change_tracker() if self.changes_only_check.isChecked() else None
+        from scraper import ScraperThread
+        self.scraper_thread = ScraperThread(url, data_type,
+                                            change_tracker=change_tracker,
+                                            results_store=results_store,
+                                            profile=profile,
+                                            check_links=self.check_links_check.isChecked(),
+                                            fetcher=fetcher,
+                                            recorder=recorder,
+                                            max_page_bytes=int(self.settings.value('max_page_mb', 10, type=float) * 1024 * 1024),
+                                            max_image_bytes=int(self.settings.value('max_image_mb', 20, type=float) * 1024 * 1024),
+                                            truncate_pages=self.settings.value('truncate_pages', False, type=bool),
+                                            paginate=self.paginate_check.isChecked(),
+                                            max_pages=self.max_pages_spin.value(),
+                                            next_selector=next_selector,
+                                            page_template=page_template,
+                                            boilerplate_filter=self.boilerplate_filter if self.boilerplate_check.isChecked() else None)
         self.scraper_thread.finished.connect(self.on_scraping_finished)
         self.scraper_thread.error.connect(self.on_scraping_error)
         self.scraper_thread.images_found.connect(self.on_images_found)
+        self.scraper_thread.link_checked.connect(self.results_text.append)
+        self.scraper_thread.page_scraped.connect(self.results_text.append)
         self.scraper_thread.start()
         self.results_text.setText("Scraping in progress...")
 
     def on_scraping_finished(self, result):
         # Stop the loading spinner
         self.loading_spinner.stop()
+        if self.store_error:
+            result += f"\n\n(Results were not saved to history: {self.store_error})"
         self.results_text.setPlainText(result)
         self.scrape_button.setEnabled(True)
         self.results_text.setPlaceholderText("Scraped data will appear here...")
@@ -531,55 +777,42 @@ class WebScraperApp(QMainWindow):
         self.scrape_button.setEnabled(True)
         self.results_text.setPlaceholderText("Scraped data will appear here...")
 
-    def on_images_found(self, image_list):
-        # Stop the loading spinner before showing dialog
-        self.loading_spinner.stop()
+    def search_history(self):
+        query = self.search_input.text().strip()
+        if not query:
+            return
         
-        reply = QMessageBox.question(
-            self,
-            'Save Images',
-            f'Would you like to save {len(image_list)} images?',
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
+        try:
+            rows = self.get_results_store().search(query)
+        except Exception as e:
+            self.results_text.setPlainText(f"Error: {str(e)}")
+            return
         
-        if reply == QMessageBox.StandardButton.Yes:
-            # Start spinner again for saving process
-            self.loading_spinner.start()
-            
-            save_dir = QFileDialog.getExistingDirectory(
-                self,
-                "Select Directory to Save Images",
-                "",
-                QFileDialog.Option.ShowDirsOnly | QFileDialog.Option.DontResolveSymlinks
-            )
-            
-            if save_dir:
-                saved_count = 0
-                for img_url, img_data in image_list:
-                    try:
-                        filename = os.path.basename(img_url.split('?')[0])
-                        if not filename:
-                            filename = f"image_{saved_count + 1}.jpg"
-                        
-                        file_path = os.path.join(save_dir, filename)
-                        
-                        base, ext = os.path.splitext(filename)
-                        counter = 1
-                        while os.path.exists(file_path):
-                            file_path = os.path.join(save_dir, f"{base}_{counter}{ext}")
-                            counter += 1
-                        
-                        with open(file_path, 'wb') as f:
-                            f.write(img_data)
-                        saved_count += 1
-                        
-                    except Exception as e:
-                        self.results_text.append(f"\nError saving image {img_url}: {str(e)}")
-                
-                self.results_text.append(f"\nSuccessfully saved {saved_count} images to {save_dir}")
-            
-            # Stop spinner after saving is complete
-            self.loading_spinner.stop()
+        if not rows:
+            self.results_text.setPlainText(f"No past results match '{query}'")
+            return
+        
+        lines = [f"{len(rows)} matches for '{query}':", ""]
+        for url, scraped_at, data_type, snippet in rows:
+            lines.append(f"[{scraped_at}] {url} ({data_type})")
+            lines.append(f"    {snippet.strip()}")
+        self.results_text.setPlainText("\n".join(lines))
+
+    def on_images_found(self, image_list):
+        # Images are picked and saved from the gallery window
+        from gallery import ImageGalleryWindow
+        if self.gallery_window:
+            self.gallery_window.close()
+        gallery = ImageGalleryWindow(image_list, self)
+        gallery.saved.connect(self.results_text.append)
+        gallery.destroyed.connect(lambda _=None: self.forget_gallery(gallery))
+        self.gallery_window = gallery
+        gallery.show()
+
+    def forget_gallery(self, gallery):
+        # Deletion is deferred, so a newer gallery may already have replaced this one
+        if self.gallery_window is gallery:
+            self.gallery_window = None
 
     def show_about(self):
         # Create about window
@@ -663,6 +896,14 @@ This demo shows how to:
             <ul>
                 <li><b>Themes:</b> Click the Themes button to customize the app's appearance</li>
                 <li><b>Auto URL Fix:</b> The app automatically adds 'https://' if needed</li>
+                <li><b>Follow next pages:</b> Walks paginated listings via rel="next", a CSS selector for the next link, or a URL template like https://example.com/list?page={page}</li>
+                <li><b>Drop boilerplate:</b> Paragraphs that repeat on most pages of a site (menus, cookie banners, footers) are left out of Text Content results</li>
+                <li><b>Image gallery:</b> After an Images scrape, preview thumbnails, tick the ones you want and click Save Selected</li>
+                <li><b>Archive:</b> Record every fetched page and image into a WARC file, then replay it to re-run extraction offline</li>
+                <li><b>Profiles:</b> Define your own fields with CSS or XPath selectors and pick them from the content type list</li>
+                <li><b>History search:</b> Every scrape is saved locally; search past headings and text without refetching</li>
+                <li><b>Check links:</b> In Links mode, every link is checked concurrently and its status, redirect and response time are listed</li>
+                <li><b>Only changes:</b> Re-scrapes of a page report just the added (+), removed (-) and changed (~) items</li>
                 <li><b>Error Handling:</b> Clear error messages if something goes wrong</li>
             </ul>
 
@@ -0,0 +1,84 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+def shingles(text, size):
+    # Word n-grams over normalised text; digits are folded so dates and
+    # counters in footers still match across pages
+    words = re.findall(r'\w+', re.sub(r'\d', '0', text.lower()))
+    if len(words) <= size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'big')
+            for g in grams}
+
+class HostTable:
+    def __init__(self):
+        self.pages = set()  # hashes of page URLs already counted
+        self.counts = {}  # shingle hash -> number of pages it was seen on
+
+class BoilerplateFilter:
+    # Drops paragraphs whose shingles show up on more than `threshold` of the
+    # pages seen from the same host. Memory is bounded per host (pages and
+    # shingles tracked) and in the number of hosts kept.
+    def __init__(self, threshold=0.6, min_pages=3, shingle_size=4, block_ratio=0.8,
+                 max_pages=500, max_shingles=50000, max_hosts=32):
+        self.threshold = threshold
+        self.min_pages = min_pages
+        self.shingle_size = shingle_size
+        self.block_ratio = block_ratio
+        self.max_pages = max_pages
+        self.max_shingles = max_shingles
+        self.max_hosts = max_hosts
+        self.hosts = OrderedDict()
+        self.lock = threading.Lock()
+
+    def table(self, url):
+        host = urlsplit(url).netloc.lower()
+        table = self.hosts.pop(host, None) or HostTable()
+        self.hosts[host] = table  # most recently used last
+        while len(self.hosts) > self.max_hosts:
+            self.hosts.popitem(last=False)
+        return table
+
+    def observe(self, table, url, blocks):
+        page = hash(url)
+        # Re-scraping the same URL must not make its own content look repeated;
+        # past max_pages the sample is big enough and counting stops
+        if page in table.pages or len(table.pages) >= self.max_pages:
+            return
+        table.pages.add(page)
+        for shingle in set().union(*blocks) if blocks else ():
+            table.counts[shingle] = table.counts.get(shingle, 0) + 1
+        if len(table.counts) > self.max_shingles:
+            self.prune(table)
+
+    def prune(self, table):
+        # Shingles seen once can't be boilerplate yet; drop them first, then
+        # the rarer half if that wasn't enough
+        table.counts = {s: c for s, c in table.counts.items() if c > 1}
+        if len(table.counts) > self.max_shingles:
+            ranked = sorted(table.counts.items(), key=lambda item: item[1], reverse=True)
+            table.counts = dict(ranked[:self.max_shingles // 2])
+
+    def is_boilerplate(self, table, block):
+        if not block:
+            return False
+        limit = self.threshold * len(table.pages)
+        frequent = sum(1 for s in block if table.counts.get(s, 0) > limit)
+        return frequent >= self.block_ratio * len(block)
+
+    def filter(self, url, items):
+        # items are (key, paragraph) pairs; returns (kept_items, dropped_count)
+        with self.lock:
+            table = self.table(url)
+            blocks = [shingles(line, self.shingle_size) for _, line in items]
+            self.observe(table, url, blocks)
+            if len(table.pages) < self.min_pages:
+                return items, 0
+            kept = [item for item, block in zip(items, blocks)
+                    if not self.is_boilerplate(table, block)]
+        return kept, len(items) - len(kept)
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import threading
+from paths import data_path
+
+def fingerprint(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+def section_fingerprint(items):
+    return fingerprint('\n'.join(sorted(h for h, _ in items.values())))
+
+class ChangeTracker:
+    # Stores, per URL and data type, a hash of the whole section plus one
+    # hash per item so a re-scrape can report only what was added, removed
+    # or changed. Validators (ETag / Last-Modified) are kept per section too,
+    # since a scrape of one data type says nothing about another.
+    PREVIEW_LENGTH = 120
+
+    def __init__(self, path=None):
+        self.path = path or data_path('fingerprints.json')
+        self.lock = threading.Lock()
+        self.pages = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.pages = json.load(f)
+            except (OSError, ValueError):
+                self.pages = {}
+
+    def save(self):
+        with self.lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.pages, f)
+            os.replace(tmp_path, self.path)
+
+    def has_section(self, url, data_type):
+        return data_type in self.pages.get(url, {}).get('sections', {})
+
+    def conditional_headers(self, url, data_type):
+        # Only worth asking the server if we can answer a 304 for this section
+        if not self.has_section(url, data_type):
+            return {}
+        section = self.pages[url]['sections'][data_type]
+        headers = {}
+        if section.get('etag'):
+            headers['If-None-Match'] = section['etag']
+        if section.get('last_modified'):
+            headers['If-Modified-Since'] = section['last_modified']
+        return headers
+
+    def update_validators(self, url, data_type, response_headers):
+        # Call after diff(), which creates the section
+        section = self.pages[url]['sections'][data_type]
+        section['etag'] = response_headers.get('ETag')
+        section['last_modified'] = response_headers.get('Last-Modified')
+
+    def forget(self, url, data_type, keys):
+        # Drops items that weren't actually handled (e.g. images that failed
+        # to download) so the next scrape reports them as added again. The
+        # validators go too, or a 304 would skip that retry.
+        section = self.pages[url]['sections'][data_type]
+        for key in keys:
+            section['items'].pop(fingerprint(key), None)
+        section['hash'] = section_fingerprint(section['items'])
+        section['etag'] = section['last_modified'] = None
+
+    def diff(self, url, data_type, items):
+        # items is a list of (key, line) pairs; returns None on the first
+        # scrape of a section, otherwise (added, removed, changed) line lists
+        page = self.pages.setdefault(url, {'sections': {}})
+        old = page['sections'].get(data_type)
+
+        new_items = {}
+        for key, line in items:
+            new_items[fingerprint(key)] = [fingerprint(line), line[:self.PREVIEW_LENGTH]]
+        section_hash = section_fingerprint(new_items)
+        page['sections'][data_type] = {'hash': section_hash, 'items': new_items}
+
+        if old is None:
+            return None
+        if old['hash'] == section_hash:
+            return [], [], []
+
+        old_items = old['items']
+        added = [line for key, line in items if fingerprint(key) not in old_items]
+        removed = [preview for key, (_, preview) in old_items.items() if key not in new_items]
+        changed = [line for key, line in items
+                   if fingerprint(key) in old_items
+                   and old_items[fingerprint(key)][0] != new_items[fingerprint(key)][0]]
+        return added, removed, changed
+
+def format_diff(added, removed, changed):
+    if not (added or removed or changed):
+        return "No changes since last scrape"
+    lines = [f"Changes since last scrape: {len(added)} added, "
+             f"{len(removed)} removed, {len(changed)} changed", ""]
+    lines += [f"+ {line}" for line in added]
+    lines += [f"- {line}" for line in removed]
+    lines += [f"~ {line}" for line in changed]
+    return "\n".join(lines)
@@ -0,0 +1,118 @@
+import argparse
+import os
+import sys
+import metrics
+from scraper import Scraper
+from change_tracker import ChangeTracker
+from results_store import ResultsStore
+from profiles import ProfileStore
+from boilerplate import BoilerplateFilter
+from warc import WarcWriter, WarcArchive, ReplayFetcher
+from image_files import save_images
+
+DATA_TYPES = ["Headings", "Links", "Text Content", "Images"]
+
+def save_image_files(image_list, save_dir):
+    os.makedirs(save_dir, exist_ok=True)
+    saved_count, errors = save_images(image_list, save_dir)
+    for img_url, error in errors:
+        print(f"Error saving image {img_url}: {error}", file=sys.stderr)
+    print(f"Saved {saved_count} images to {save_dir}", file=sys.stderr)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py --headless",
+                                     description="Scrape a page without opening the window.")
+    parser.add_argument("url")
+    parser.add_argument("--type", dest="data_type", choices=DATA_TYPES, default="Headings")
+    parser.add_argument("--profile", help="name of a saved extraction profile")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="report only what changed since the last scrape")
+    parser.add_argument("--check-links", action="store_true",
+                        help="with --type Links, probe every link for status, redirect and latency")
+    parser.add_argument("--paginate", action="store_true",
+                        help="follow next-page links (rel=next unless --next-selector/--page-template)")
+    parser.add_argument("--max-pages", type=int, default=10, help="page limit for --paginate (default 10)")
+    parser.add_argument("--next-selector", help="CSS selector of the next-page link")
+    parser.add_argument("--page-template", help="URL with a {page} placeholder, e.g. 'https://site/list?page={page}'")
+    parser.add_argument("--drop-boilerplate", action="store_true",
+                        help="with --type 'Text Content', drop paragraphs repeated across pages of the site")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument("--record", metavar="WARC", help="archive every fetched page and image to this WARC file")
+    archive.add_argument("--replay", metavar="WARC", help="serve all fetches from this WARC file instead of the network")
+    parser.add_argument("--no-history", action="store_true",
+                        help="don't save the results to the history database")
+    parser.add_argument("--max-page-mb", type=float, default=10,
+                        help="abort pages larger than this (default 10)")
+    parser.add_argument("--max-image-mb", type=float, default=20,
+                        help="skip images larger than this (default 20)")
+    parser.add_argument("--truncate-pages", action="store_true",
+                        help="parse the first --max-page-mb of oversize pages instead of failing")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="serve Prometheus metrics on localhost:PORT/metrics while running")
+    parser.add_argument("--metrics-file", help="write Prometheus metrics to this file")
+    parser.add_argument("--metrics-interval", type=float, default=15,
+                        help="seconds between --metrics-file dumps (default 15)")
+    parser.add_argument("--save-images", metavar="DIR", help="directory for Images results")
+    return parser
+
+def main(argv):
+    args = build_parser().parse_args(argv)
+    url = args.url
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+
+    profile = None
+    if args.profile:
+        profile = ProfileStore().get(args.profile)
+        if profile is None:
+            print(f"Error: no profile named '{args.profile}'", file=sys.stderr)
+            return 2
+
+    try:
+        recorder = WarcWriter(args.record) if args.record else None
+        fetcher = ReplayFetcher(WarcArchive(args.replay)) if args.replay else None
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    # History is optional; a broken database shouldn't stop the scrape
+    results_store = None
+    if not args.no_history:
+        try:
+            results_store = ResultsStore()
+        except Exception as e:
+            print(f"(Results were not saved to history: {e})", file=sys.stderr)
+
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port)
+    if args.metrics_file:
+        stop_dump = metrics.start_file_dump(args.metrics_file, args.metrics_interval)
+
+    scraper = Scraper(url, args.data_type,
+                      change_tracker=ChangeTracker() if args.changes_only else None,
+                      results_store=results_store,
+                      profile=profile,
+                      check_links=args.check_links,
+                      max_page_bytes=int(args.max_page_mb * 1024 * 1024),
+                      max_image_bytes=int(args.max_image_mb * 1024 * 1024),
+                      truncate_pages=args.truncate_pages,
+                      paginate=args.paginate or bool(args.next_selector or args.page_template),
+                      max_pages=args.max_pages,
+                      next_selector=args.next_selector,
+                      page_template=args.page_template,
+                      boilerplate_filter=BoilerplateFilter() if args.drop_boilerplate else None,
+                      fetcher=fetcher,
+                      recorder=recorder)
+    on_images = (lambda images: save_image_files(images, args.save_images)) if args.save_images else None
+    on_link_checked = (lambda line: print(line, file=sys.stderr, flush=True)) if args.check_links else None
+    try:
+        print(scraper.run(on_images, on_link_checked))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if recorder:
+            recorder.close()
+        if args.metrics_file:
+            stop_dump()
+    return 0
@@ -0,0 +1,70 @@
+import ipaddress
+import socket
+import threading
+import time
+from collections import OrderedDict
+import urllib3.util.connection
+import metrics
+
+class DnsCache:
+    # getaddrinfo results per (host, port), kept for `ttl` seconds; the
+    # oldest entries are evicted past max_entries
+    def __init__(self, ttl=60, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def resolve(self, host, port):
+        key = (host.lower(), port)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > now:
+                self.entries.move_to_end(key)
+                metrics.CACHE_LOOKUPS.inc(cache='dns', result='hit')
+                return entry[1]
+        metrics.CACHE_LOOKUPS.inc(cache='dns', result='miss')
+        addresses = []
+        for *_, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+        with self.lock:
+            self.entries[key] = (now + self.ttl, addresses)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return addresses
+
+DNS_CACHE = DnsCache()
+_original_create_connection = None
+
+def is_ip(host):
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+def create_connection(address, *args, **kwargs):
+    # urllib3 connects to `_dns_host` but verifies TLS against the real host
+    # name, so swapping in a cached IP here keeps SNI and certificates intact
+    host, port = address
+    if is_ip(host):
+        return _original_create_connection(address, *args, **kwargs)
+    error = None
+    for ip in DNS_CACHE.resolve(host, port):
+        try:
+            return _original_create_connection((ip, port), *args, **kwargs)
+        except OSError as e:
+            error = e
+    if error is not None:
+        raise error
+    return _original_create_connection(address, *args, **kwargs)
+
+def install():
+    # Route every urllib3 connection (and so every requests session) through the cache
+    global _original_create_connection
+    if _original_create_connection is None:
+        _original_create_connection = urllib3.util.connection.create_connection
+        urllib3.util.connection.create_connection = create_connection
@@ -0,0 +1,210 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+import dns_cache
+import metrics
+
+# Worth another try: throttling and the usual gateway / overload errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Bytes pulled from the socket per read while streaming a body
+CHUNK_SIZE = 64 * 1024
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+class ResponseTooLarge(requests.RequestException):
+    pass
+
+def retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class CircuitBreaker:
+    # Per host: after `threshold` consecutive failures the circuit opens and
+    # requests fail immediately; after `cooldown` seconds one trial request
+    # is let through (half-open) and its outcome closes or re-opens it
+    def __init__(self, threshold=5, cooldown=30):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = {}
+        self.opened_at = {}
+        self.lock = threading.Lock()
+
+    def allow(self, host):
+        with self.lock:
+            opened = self.opened_at.get(host)
+            if opened is None:
+                return True
+            if time.monotonic() - opened >= self.cooldown:
+                self.opened_at[host] = time.monotonic()  # one trial per cooldown
+                return True
+            return False
+
+    def record_success(self, host):
+        with self.lock:
+            self.failures.pop(host, None)
+            self.opened_at.pop(host, None)
+
+    def record_failure(self, host):
+        # Returns True when this failure trips the breaker
+        with self.lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            if self.failures[host] >= self.threshold:
+                tripped = host not in self.opened_at
+                self.opened_at[host] = time.monotonic()
+                return tripped
+            return False
+
+class Fetcher:
+    offline = False  # True for fetchers that never touch the network (see warc.ReplayFetcher)
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30, timeout=15, breaker=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        dns_cache.install()
+        self.session = requests.Session()
+        self.stats = {'requests': 0, 'retries': 0, 'trips': 0, 'short_circuited': 0}
+        self.stats_lock = threading.Lock()
+
+    def count(self, name, amount=1):
+        with self.stats_lock:
+            self.stats[name] += amount
+
+    def snapshot(self):
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def delay(self, attempt, response=None):
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def failed(self, host):
+        if self.breaker.record_failure(host):
+            self.count('trips')
+            metrics.CIRCUIT_TRIPS.inc()
+
+    def prewarm(self, url):
+        # Resolve the host and leave an open (TLS-negotiated) connection in
+        # the session's pool so the first real request skips the handshakes.
+        # No request is sent. Best effort: any failure just means a cold start.
+        parts = urlsplit(url)
+        if not parts.hostname:
+            return False
+        try:
+            dns_cache.DNS_CACHE.resolve(parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+            adapter = self.session.get_adapter(url)
+            pool = adapter.poolmanager.connection_from_url(url)
+            conn = pool._get_conn()
+            try:
+                if getattr(conn, 'sock', None) is None:
+                    conn.timeout = self.timeout
+                    conn.connect()
+            except Exception:
+                conn.close()
+                raise
+            finally:
+                pool._put_conn(conn)
+        except Exception:
+            return False
+        return True
+
+    def get(self, url, **kwargs):
+        host = urlsplit(url).netloc.lower()
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow(host):
+                self.count('short_circuited')
+                metrics.ERRORS.inc(type='circuit_open')
+                raise CircuitOpenError(f"{host} is failing repeatedly; skipping {url}")
+            last_attempt = attempt == self.retries
+            self.count('requests')
+            metrics.request_sent()
+            try:
+                with metrics.PHASE_SECONDS.time(phase='request'):
+                    response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.ERRORS.inc(type='timeout' if isinstance(e, requests.Timeout) else 'connection')
+                self.failed(host)
+                if last_attempt:
+                    raise
+                wait = self.delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success(host)
+                    return response
+                metrics.ERRORS.inc(type=f'http_{response.status_code}')
+                if response.status_code != 429:  # throttling doesn't mean the host is down
+                    self.failed(host)
+                if last_attempt:
+                    return response
+                wait = self.delay(attempt, response)
+                response.close()
+            self.count('retries')
+            metrics.RETRIES.inc()
+            time.sleep(wait)
+
+def read_body(response, max_bytes, allow_truncated=False):
+    # Streams the body, stopping as soon as it is known to exceed max_bytes.
+    # Returns (body, truncated); with allow_truncated the first max_bytes are
+    # kept instead of raising ResponseTooLarge.
+    try:
+        length = int(response.headers.get('Content-Length', ''))
+    except ValueError:
+        length = None
+    if length is not None and length > max_bytes and not allow_truncated:
+        response.close()
+        metrics.ERRORS.inc(type='too_large')
+        raise ResponseTooLarge(f"{response.url} is {length} bytes (limit {max_bytes})")
+
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+            metrics.BYTES_IN.inc(len(chunk))
+            if size > max_bytes:
+                if not allow_truncated:
+                    metrics.ERRORS.inc(type='too_large')
+                    raise ResponseTooLarge(f"{response.url} exceeds the {max_bytes} byte limit")
+                chunks.append(chunk[:max_bytes - (size - len(chunk))])
+                return b"".join(chunks), True
+            chunks.append(chunk)
+    finally:
+        response.close()
+    return b"".join(chunks), False
+
+def format_stats(before, after, failed_images=0, oversized_images=0):
+    delta = {name: after[name] - before.get(name, 0) for name in after}
+    parts = []
+    if delta['retries']:
+        parts.append(f"{delta['retries']} retries")
+    if delta['trips']:
+        parts.append(f"{delta['trips']} circuit breaker trips")
+    if delta['short_circuited']:
+        parts.append(f"{delta['short_circuited']} requests skipped (host down)")
+    if failed_images:
+        parts.append(f"{failed_images} images failed")
+    if oversized_images:
+        parts.append(f"{oversized_images} images over the size limit")
+    if not parts:
+        return ""
+    return "Fetch stats: " + ", ".join(parts)
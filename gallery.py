@@ -0,0 +1,205 @@
+import os
+from collections import OrderedDict
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QListView,
+                             QPushButton, QLabel, QFileDialog, QAbstractItemView)
+from PyQt6.QtCore import (Qt, QAbstractListModel, QModelIndex, QObject, QRunnable,
+                          QThreadPool, QSize, pyqtSignal)
+from PyQt6.QtGui import QImage, QColor
+from image_files import save_images
+
+THUMBNAIL_SIZE = 160
+# Scaled thumbnails kept in memory; the least recently shown go first
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+class ThumbnailCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.images = OrderedDict()
+
+    def get(self, key):
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        if key in self.images:
+            self.total_bytes -= self.images.pop(key).sizeInBytes()
+        self.images[key] = image
+        self.total_bytes += image.sizeInBytes()
+        while self.total_bytes > self.max_bytes and len(self.images) > 1:
+            _, evicted = self.images.popitem(last=False)
+            self.total_bytes -= evicted.sizeInBytes()
+
+class DecodeSignals(QObject):
+    decoded = pyqtSignal(int, QImage)
+
+class DecodeJob(QRunnable):
+    # QImage (unlike QPixmap) is safe to build off the GUI thread
+    def __init__(self, row, data, signals):
+        super().__init__()
+        self.row = row
+        self.data = data
+        self.signals = signals
+
+    def run(self):
+        image = QImage()
+        if image.loadFromData(self.data):
+            image = image.scaled(THUMBNAIL_SIZE, THUMBNAIL_SIZE,
+                                 Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        self.signals.decoded.emit(self.row, image)
+
+class ImageListModel(QAbstractListModel):
+    # Thumbnails are only decoded when the view asks for them, i.e. when
+    # the item is scrolled into view
+    def __init__(self, image_list, parent=None):
+        super().__init__(parent)
+        self.image_list = image_list
+        self.checked = [True] * len(image_list)
+        self.cache = ThumbnailCache()
+        self.pending = {}  # row -> DecodeJob, queued or already running
+        self.pool = QThreadPool(self)
+        self.signals = DecodeSignals()
+        self.signals.decoded.connect(self.on_decoded)
+        self.placeholder = QImage(THUMBNAIL_SIZE, THUMBNAIL_SIZE, QImage.Format.Format_RGB32)
+        self.placeholder.fill(QColor('#dddddd'))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.image_list)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        img_url, img_data = self.image_list[row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(img_url.split('?')[0]) or img_url
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{img_url}\n{len(img_data) // 1024} KB"
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if self.checked[row] else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.DecorationRole:
+            image = self.cache.get(row)
+            if image is None:
+                self.request_decode(row)
+                return self.placeholder
+            return image
+        return None
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemFlag.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        self.checked[index.row()] = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def set_all_checked(self, checked):
+        self.checked = [checked] * len(self.image_list)
+        if self.image_list:
+            self.dataChanged.emit(self.index(0), self.index(len(self.image_list) - 1),
+                                  [Qt.ItemDataRole.CheckStateRole])
+
+    def selected_images(self):
+        return [item for item, checked in zip(self.image_list, self.checked) if checked]
+
+    def request_decode(self, row):
+        if row not in self.pending:
+            job = DecodeJob(row, self.image_list[row][1], self.signals)
+            job.setAutoDelete(False)  # kept alive by self.pending so tryTake() stays safe
+            self.pending[row] = job
+            self.pool.start(job)
+
+    def cancel_pending(self):
+        # Drop queued decodes for items scrolled past; visible ones are asked
+        # for again on the next paint. Jobs already running stay pending
+        # until they report back, so they are never queued twice.
+        for row, job in list(self.pending.items()):
+            if self.pool.tryTake(job):
+                del self.pending[row]
+
+    def on_decoded(self, row, image):
+        self.pending.pop(row, None)
+        if image.isNull():
+            image = self.placeholder
+        self.cache.put(row, image)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+class ImageGalleryWindow(QMainWindow):
+    saved = pyqtSignal(str)
+
+    def __init__(self, image_list, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)  # frees the image bytes and thumbnails
+        self.setWindowTitle(f"Images ({len(image_list)})")
+        self.setMinimumSize(800, 600)
+        self.model = ImageListModel(image_list, self)
+        self.setup_ui()
+        self.update_status()
+
+    def setup_ui(self):
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout()
+        main_widget.setLayout(layout)
+
+        self.view = QListView()
+        self.view.setViewMode(QListView.ViewMode.IconMode)
+        self.view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.view.setMovement(QListView.Movement.Static)
+        self.view.setUniformItemSizes(True)  # lets the view lay out thousands of items cheaply
+        self.view.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.view.setGridSize(QSize(THUMBNAIL_SIZE + 30, THUMBNAIL_SIZE + 50))
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.view.setModel(self.model)
+        self.view.verticalScrollBar().valueChanged.connect(lambda _: self.model.cancel_pending())
+        self.model.dataChanged.connect(lambda *_: self.update_status())
+        layout.addWidget(self.view)
+
+        button_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        select_all_btn = QPushButton("Select All")
+        select_all_btn.clicked.connect(lambda: self.model.set_all_checked(True))
+        select_none_btn = QPushButton("Select None")
+        select_none_btn.clicked.connect(lambda: self.model.set_all_checked(False))
+        save_btn = QPushButton("Save Selected")
+        save_btn.clicked.connect(self.save_selected)
+        button_layout.addWidget(self.status_label)
+        button_layout.addStretch()
+        button_layout.addWidget(select_all_btn)
+        button_layout.addWidget(select_none_btn)
+        button_layout.addWidget(save_btn)
+        layout.addLayout(button_layout)
+
+    def update_status(self):
+        selected = sum(self.model.checked)
+        self.status_label.setText(f"{selected} of {len(self.model.image_list)} images selected")
+
+    def save_selected(self):
+        image_list = self.model.selected_images()
+        if not image_list:
+            return
+
+        save_dir = QFileDialog.getExistingDirectory(
+            self,
+            "Select Directory to Save Images",
+            "",
+            QFileDialog.Option.ShowDirsOnly | QFileDialog.Option.DontResolveSymlinks
+        )
+        if not save_dir:
+            return
+
+        saved_count, errors = save_images(image_list, save_dir)
+        for img_url, error in errors:
+            self.saved.emit(f"\nError saving image {img_url}: {error}")
+        self.saved.emit(f"\nSuccessfully saved {saved_count} images to {save_dir}")
+        self.status_label.setText(f"Saved {saved_count} images to {save_dir}")
+
+    def closeEvent(self, event):
+        self.model.cancel_pending()
+        super().closeEvent(event)
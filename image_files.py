@@ -0,0 +1,28 @@
+import os
+
+def save_images(image_list, save_dir):
+    # Writes (url, data) pairs into save_dir without overwriting existing
+    # files; returns (saved_count, [(url, error_message), ...])
+    saved_count = 0
+    errors = []
+    for img_url, img_data in image_list:
+        try:
+            filename = os.path.basename(img_url.split('?')[0])
+            if not filename:
+                filename = f"image_{saved_count + 1}.jpg"
+
+            file_path = os.path.join(save_dir, filename)
+
+            base, ext = os.path.splitext(filename)
+            counter = 1
+            while os.path.exists(file_path):
+                file_path = os.path.join(save_dir, f"{base}_{counter}{ext}")
+                counter += 1
+
+            with open(file_path, 'wb') as f:
+                f.write(img_data)
+            saved_count += 1
+
+        except Exception as e:
+            errors.append((img_url, str(e)))
+    return saved_count, errors
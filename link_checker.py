@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urldefrag, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+import metrics
+
+LinkResult = namedtuple('LinkResult', 'url status redirect latency error')
+
+# Servers that don't handle HEAD properly tend to answer with one of these
+HEAD_FALLBACK_STATUSES = (403, 405, 501)
+
+def collect_links(page_url, hrefs):
+    # Resolve against the page, drop fragments and non-http schemes, dedup in order
+    seen = set()
+    urls = []
+    for href in hrefs:
+        url, _ = urldefrag(urljoin(page_url, href.strip()))
+        if urlsplit(url).scheme in ('http', 'https') and url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+def format_link_result(result):
+    if result.error:
+        return f"[ERR] {result.url} ({result.error})"
+    line = f"[{result.status}] {result.latency * 1000:.0f}ms {result.url}"
+    if result.redirect:
+        line += f" -> {result.redirect}"
+    return line
+
+class LinkChecker:
+    def __init__(self, max_workers=64, per_host=8, timeout=10):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.session = requests.Session()
+        # pool_maxsize is per host, so it matches the per-host concurrency limit
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=per_host)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.host_slots = {}
+        self.host_slots_lock = threading.Lock()
+
+    def host_slot(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self.host_slots_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_slots[host]
+
+    def probe(self, url):
+        with self.host_slot(url):
+            start = time.perf_counter()
+            metrics.request_sent()
+            try:
+                response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+                if response.status_code in HEAD_FALLBACK_STATUSES:
+                    # Ask for a single byte instead of the whole body
+                    response = self.session.get(url, headers={'Range': 'bytes=0-0'},
+                                                stream=True, allow_redirects=True,
+                                                timeout=self.timeout)
+                    response.close()
+            except requests.RequestException as e:
+                metrics.ERRORS.inc(type='link_probe')
+                return LinkResult(url, None, None, time.perf_counter() - start, type(e).__name__)
+            latency = time.perf_counter() - start
+            metrics.PHASE_SECONDS.observe(latency, phase='link_probe')
+        redirect = response.url if response.history else None
+        return LinkResult(url, response.status_code, redirect, latency, None)
+
+    def check(self, urls, on_result=None):
+        # Results are handed to on_result as they complete; the returned
+        # list keeps the original link order
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.probe, url): url for url in urls}
+            metrics.QUEUE_DEPTH.inc(len(futures), queue='link_check')
+            for future in as_completed(futures):
+                metrics.QUEUE_DEPTH.dec(queue='link_check')
+                result = future.result()
+                results[result.url] = result
+                if on_result:
+                    on_result(result)
+        return [results[url] for url in urls]
+
+    def close(self):
+        self.session.close()
+
+def summarize(results):
+    ok = sum(1 for r in results if r.status and r.status < 400)
+    redirected = sum(1 for r in results if r.redirect)
+    broken = len(results) - ok
+    return f"Checked {len(results)} links: {ok} ok ({redirected} redirected), {broken} broken"
@@ -1,8 +1,13 @@
 import sys
-from PyQt6.QtWidgets import QApplication
-from app import WebScraperApp
 
 if __name__ == '__main__':
+    if '--headless' in sys.argv:
+        from cli import main
+        sys.exit(main([arg for arg in sys.argv[1:] if arg != '--headless']))
+
+    from PyQt6.QtWidgets import QApplication
+    from app import WebScraperApp
+
     app = QApplication(sys.argv)
     window = WebScraperApp()
     window.show()
@@ -0,0 +1,61 @@
+import os
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def current_rss():
+    # Resident set size in bytes, or None where /proc isn't available
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def process_peak_rss():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # KiB on Linux
+
+class PeakRssSampler:
+    # Polls RSS in the background while a scrape runs. Where RSS can't be
+    # sampled, falls back to the process-wide peak.
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = current_rss()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        if self.peak is not None:
+            self.thread = threading.Thread(target=self.sample, daemon=True)
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        else:
+            self.peak = process_peak_rss()
+        return False
+
+    def sample(self):
+        while not self.stop_event.wait(self.interval):
+            rss = current_rss()
+            if rss and rss > self.peak:
+                self.peak = rss
+        rss = current_rss()
+        if rss and rss > self.peak:
+            self.peak = rss
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,245 @@
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Seconds; covers everything from a cached lookup to a slow page download
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+def format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        # Unlabelled series start at 0 so they show up before the first event
+        self.values = {} if self.labels else {(): 0}
+        self.function = None
+        self.lock = threading.Lock()
+
+    def key(self, labels):
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def set_function(self, function):
+        # Value is read from function() at render time instead of being tracked
+        self.function = function
+
+    def samples(self):
+        if self.function is not None:
+            return [(self.name, "", self.function())]
+        with self.lock:
+            return [(self.name, format_labels(self.labels, key), value)
+                    for key, value in sorted(self.values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{labels} {format_value(value)}" for name, labels, value in self.samples()]
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[self.key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.values = {}
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        with self.lock:
+            counts, total = self.values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self.values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        samples = []
+        with self.lock:
+            for key, (counts, total) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = format_value(bound if bound == float('inf') else float(bound))
+                    samples.append((self.name + "_bucket",
+                                    format_labels(self.labels, key, [("le", le)]), cumulative))
+                samples.append((self.name + "_sum", format_labels(self.labels, key), total))
+                samples.append((self.name + "_count", format_labels(self.labels, key), cumulative))
+        return samples
+
+class RateWindow:
+    # Events per second over the last `window` seconds
+    def __init__(self, window=10):
+        self.window = window
+        self.events = deque()
+        self.lock = threading.Lock()
+
+    def trim(self, now):
+        while self.events and self.events[0] < now - self.window:
+            self.events.popleft()
+
+    def record(self):
+        now = time.monotonic()
+        with self.lock:
+            self.events.append(now)
+            self.trim(now)
+
+    def rate(self):
+        with self.lock:
+            self.trim(time.monotonic())
+            return len(self.events) / self.window
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    "scraper_http_requests_total", "HTTP requests sent (including retries and link probes)"))
+REQUEST_RATE = RateWindow()
+REGISTRY.register(Gauge(
+    "scraper_requests_per_second", "HTTP requests per second over the last 10 seconds")
+).set_function(REQUEST_RATE.rate)
+BYTES_IN = REGISTRY.register(Counter(
+    "scraper_bytes_received_total", "Response body bytes read"))
+ERRORS = REGISTRY.register(Counter(
+    "scraper_errors_total", "Failed fetches and scrapes by type", ["type"]))
+RETRIES = REGISTRY.register(Counter(
+    "scraper_retries_total", "Fetches retried after a transient failure"))
+CIRCUIT_TRIPS = REGISTRY.register(Counter(
+    "scraper_circuit_trips_total", "Times a per-host circuit breaker opened"))
+SCRAPES = REGISTRY.register(Counter(
+    "scraper_scrapes_total", "Completed scrape jobs by outcome", ["outcome"]))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "scraper_cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"]))
+PHASE_SECONDS = REGISTRY.register(Histogram(
+    "scraper_phase_seconds", "Time spent per pipeline phase", ["phase"]))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "scraper_jobs_in_flight", "Scrape jobs currently running"))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "scraper_queue_depth", "Work items queued but not finished", ["queue"]))
+
+def request_sent():
+    REQUESTS.inc()
+    REQUEST_RATE.record()
+
+def start_http_server(port, host='127.0.0.1'):
+    # http.server is only imported when an endpoint is actually wanted
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = REGISTRY.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep scrape output clean
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def dump_to_file(path):
+    # A temp file of its own per write, so concurrent dumps can't clobber each other
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                     prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                     delete=False) as f:
+        f.write(REGISTRY.render())
+    try:
+        os.replace(f.name, path)  # readers never see a half-written file
+    except OSError:
+        os.remove(f.name)
+        raise
+
+def start_file_dump(path, interval=15):
+    # Returns a stop() that writes the final dump and waits for it
+    stop_event = threading.Event()
+
+    def loop():
+        while not stop_event.wait(interval):
+            dump_to_file(path)
+        dump_to_file(path)
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+
+    def stop():
+        stop_event.set()
+        thread.join()
+
+    return stop
@@ -0,0 +1,8 @@
+import os
+
+# Everything the app persists between runs (besides QSettings) lives here
+DATA_DIR = os.path.join(os.path.expanduser('~'), '.scrapapp')
+
+def data_path(*parts):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, *parts)
@@ -0,0 +1,95 @@
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QComboBox, QLineEdit, QTextEdit, QPushButton, QMessageBox)
+from PyQt6.QtGui import QFont
+from profiles import Profile, ProfileError
+
+NEW_PROFILE = "<New profile>"
+
+class ProfileWindow(QMainWindow):
+    def __init__(self, main_app):
+        super().__init__()
+        self.main_app = main_app
+        self.store = main_app.profile_store
+        self.setWindowTitle("Extraction Profiles")
+        self.setMinimumSize(500, 400)
+        self.setup_ui()
+        self.reload_profiles()
+
+    def setup_ui(self):
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        main_widget.setLayout(layout)
+
+        header = QLabel("Extraction Profiles")
+        header.setFont(QFont('Segoe UI', 18, QFont.Weight.Bold))
+        layout.addWidget(header)
+
+        self.profile_combo = QComboBox()
+        self.profile_combo.currentTextChanged.connect(self.load_profile)
+        layout.addWidget(self.profile_combo)
+
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText("Profile name")
+        layout.addWidget(self.name_input)
+
+        description = QLabel("One field per line, e.g.\n"
+                             "price = css: .product .price\n"
+                             "title = xpath: //h1/text()")
+        description.setWordWrap(True)
+        layout.addWidget(description)
+
+        self.fields_input = QTextEdit()
+        self.fields_input.setAcceptRichText(False)
+        self.fields_input.setFont(QFont('Consolas', 10))
+        layout.addWidget(self.fields_input)
+
+        button_layout = QHBoxLayout()
+        save_btn = QPushButton("Save")
+        save_btn.clicked.connect(self.save_profile)
+        delete_btn = QPushButton("Delete")
+        delete_btn.clicked.connect(self.delete_profile)
+        button_layout.addStretch()
+        button_layout.addWidget(delete_btn)
+        button_layout.addWidget(save_btn)
+        layout.addLayout(button_layout)
+
+    def reload_profiles(self, selected=None):
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems([NEW_PROFILE] + self.store.names())
+        self.profile_combo.blockSignals(False)
+        self.profile_combo.setCurrentText(selected or NEW_PROFILE)
+        self.load_profile(self.profile_combo.currentText())
+
+    def load_profile(self, name):
+        profile = self.store.get(name)
+        self.name_input.setText(profile.name if profile else "")
+        self.fields_input.setPlainText(profile.to_lines() if profile else "")
+
+    def save_profile(self):
+        name = self.name_input.text().strip()
+        if not name:
+            QMessageBox.warning(self, "Invalid Profile", "Please give the profile a name.")
+            return
+        try:
+            profile = Profile.from_lines(name, self.fields_input.toPlainText())
+        except ProfileError as e:
+            QMessageBox.warning(self, "Invalid Profile", str(e))
+            return
+
+        old_name = self.profile_combo.currentText()
+        if old_name != NEW_PROFILE and old_name != name:
+            self.store.delete_profile(old_name)  # renamed
+        self.store.save_profile(profile)
+        self.reload_profiles(name)
+        self.main_app.refresh_profiles()
+
+    def delete_profile(self):
+        name = self.profile_combo.currentText()
+        if name == NEW_PROFILE:
+            return
+        self.store.delete_profile(name)
+        self.reload_profiles()
+        self.main_app.refresh_profiles()
@@ -0,0 +1,128 @@
+import json
+import os
+from functools import lru_cache
+from paths import data_path
+import metrics
+
+PROFILE_PREFIX = "Profile: "
+
+class ProfileError(Exception):
+    pass
+
+@lru_cache(maxsize=256)
+def compile_selector(kind, expression):
+    # Compiled once per (kind, expression) and reused for every page. lxml is
+    # imported here rather than at module level to keep app startup light.
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+    try:
+        if kind == 'css':
+            return CSSSelector(expression)
+        if kind == 'xpath':
+            return etree.XPath(expression)
+    except Exception as e:
+        raise ProfileError(f"Invalid {kind} selector '{expression}': {e}")
+    raise ProfileError(f"Unknown selector type '{kind}' (use css or xpath)")
+
+metrics.REGISTRY.register(metrics.Counter(
+    "scraper_selector_cache_hits_total", "Compiled selector cache hits")
+).set_function(lambda: compile_selector.cache_info().hits)
+metrics.REGISTRY.register(metrics.Counter(
+    "scraper_selector_cache_misses_total", "Compiled selector cache misses")
+).set_function(lambda: compile_selector.cache_info().misses)
+
+def match_text(match):
+    # XPath can return elements, attribute values or text nodes
+    from lxml import etree
+    if isinstance(match, etree._Element):
+        return match.text_content().strip()
+    if isinstance(match, bool):
+        return 'true' if match else 'false'
+    if isinstance(match, float):
+        return str(int(match)) if match.is_integer() else str(match)
+    return str(match).strip()
+
+def as_matches(result):
+    # Node-sets come back as lists; string(), count() and boolean
+    # expressions return a single value
+    return result if isinstance(result, list) else [result]
+
+class Profile:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields  # list of (field_name, kind, expression)
+
+    @property
+    def data_type(self):
+        return PROFILE_PREFIX + self.name
+
+    def compile(self):
+        return [(field, compile_selector(kind, expression))
+                for field, kind, expression in self.fields]
+
+    def extract(self, page_html, page_url):
+        from lxml import etree, html as lxml_html
+        try:
+            tree = lxml_html.fromstring(page_html, base_url=page_url)
+        except (etree.ParserError, ValueError) as e:
+            raise ProfileError(f"Could not parse the page: {e}")
+        items = []
+        for field, selector in self.compile():
+            for match in as_matches(selector(tree)):
+                text = match_text(match)
+                if text:
+                    items.append((f"{field}:{text}", f"{field}: {text}"))
+        return items
+
+    def to_lines(self):
+        return "\n".join(f"{field} = {kind}: {expression}"
+                         for field, kind, expression in self.fields)
+
+    @classmethod
+    def from_lines(cls, name, text):
+        # One field per line: "price = css: .product .price"
+        fields = []
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            field, sep, rest = line.partition('=')
+            kind, sep2, expression = rest.partition(':')
+            if not sep or not sep2 or not field.strip() or not expression.strip():
+                raise ProfileError(f"Line {number}: expected 'field = css: selector' or 'field = xpath: expression'")
+            fields.append((field.strip(), kind.strip().lower(), expression.strip()))
+        if not fields:
+            raise ProfileError("A profile needs at least one field")
+        profile = cls(name, fields)
+        profile.compile()  # validate every selector up front
+        return profile
+
+class ProfileStore:
+    def __init__(self, path=None):
+        self.path = path or data_path('profiles.json')
+        self.profiles = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for name, fields in json.load(f).items():
+                        self.profiles[name] = Profile(name, [tuple(field) for field in fields])
+            except (OSError, ValueError):
+                self.profiles = {}
+
+    def names(self):
+        return sorted(self.profiles)
+
+    def get(self, name):
+        return self.profiles.get(name)
+
+    def save_profile(self, profile):
+        self.profiles[profile.name] = profile
+        self.save()
+
+    def delete_profile(self, name):
+        self.profiles.pop(name, None)
+        self.save()
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({name: p.fields for name, p in self.profiles.items()}, f, indent=2)
@@ -0,0 +1,82 @@
+import sqlite3
+import threading
+from datetime import datetime
+from paths import data_path
+
+# Data types whose items go into the full-text index
+INDEXED_TYPES = ("Headings", "Text Content")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS scrapes (
+        id INTEGER PRIMARY KEY,
+        url TEXT NOT NULL,
+        scraped_at TEXT NOT NULL,
+        data_type TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS items (
+        id INTEGER PRIMARY KEY,
+        scrape_id INTEGER NOT NULL REFERENCES scrapes(id),
+        position INTEGER NOT NULL,
+        content TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS items_scrape ON items(scrape_id);
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        content, content='items', content_rowid='id'
+    );
+"""
+
+def fts_query(text):
+    # Quote every term so user input can't break FTS5 syntax; prefix-match each one
+    terms = [t.replace('"', '""') for t in text.split()]
+    return " ".join(f'"{t}"*' for t in terms)
+
+class ResultsStore:
+    def __init__(self, path=None):
+        self.path = path or data_path('results.db')
+        # One connection per thread: scrapes write from ScraperThread while
+        # searches read from the GUI thread, which WAL lets run side by side
+        self.local = threading.local()
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def add_scrape(self, url, data_type, items):
+        conn = self.connection()
+        with conn:  # single transaction for the whole batch
+            cur = conn.execute(
+                "INSERT INTO scrapes (url, scraped_at, data_type) VALUES (?, ?, ?)",
+                (url, datetime.now().isoformat(timespec='seconds'), data_type))
+            scrape_id = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO items (scrape_id, position, content) VALUES (?, ?, ?)",
+                ((scrape_id, i, content) for i, content in enumerate(items)))
+            if data_type in INDEXED_TYPES:
+                conn.execute(
+                    "INSERT INTO items_fts (rowid, content) "
+                    "SELECT id, content FROM items WHERE scrape_id = ?", (scrape_id,))
+        return scrape_id
+
+    def search(self, text, limit=100):
+        query = fts_query(text)
+        if not query:
+            return []
+        rows = self.connection().execute("""
+            SELECT s.url, s.scraped_at, s.data_type,
+                   snippet(items_fts, 0, '[', ']', '...', 16)
+            FROM items_fts
+            JOIN items i ON i.id = items_fts.rowid
+            JOIN scrapes s ON s.id = i.scrape_id
+            WHERE items_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (query, limit))
+        return rows.fetchall()
@@ -1,80 +1,335 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 import requests
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
 from bs4 import BeautifulSoup
+from change_tracker import format_diff
+from fetcher import Fetcher, ResponseTooLarge, read_body, format_stats
+from memory import PeakRssSampler, format_bytes
+import metrics
+from profiles import ProfileError
+from link_checker import LinkChecker, collect_links, format_link_result, summarize
 
-class ScraperThread(QThread):
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-    images_found = pyqtSignal(list)  # Changed to emit list of tuples (url, data)
+# Bodies are streamed and abandoned once they pass these sizes
+DEFAULT_MAX_PAGE_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_IMAGE_BYTES = 20 * 1024 * 1024
 
-    def __init__(self, url, data_type):
-        super().__init__()
+class ScrapeError(Exception):
+    pass
+
+def resolve_image_url(page_url, img_url):
+    if not img_url.startswith(('http://', 'https://')):
+        # Handle relative URLs
+        if img_url.startswith('/'):
+            base_url = '/'.join(page_url.split('/')[:3])
+            img_url = base_url + img_url
+        else:
+            img_url = page_url.rstrip('/') + '/' + img_url
+    return img_url
+
+def extract_items(soup, data_type, page_url):
+    # Returns (key, line) pairs: the key identifies an item across scrapes,
+    # the line is what gets shown in the results
+    items = []
+    if data_type == "Headings":
+        for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+            level = int(h.name[1])  # Get heading level (1-6)
+            indent = "  " * (level - 1)  # Indent based on heading level
+            text = h.text.strip()
+            if text:  # Only include non-empty headings
+                line = f"{indent}[H{level}] {text}"
+                items.append((line, line))
+    elif data_type == "Links":
+        for link in soup.find_all('a', href=True):
+            text = link.text.strip()
+            if text:
+                items.append((link['href'], f"{text} - {link['href']}"))
+    elif data_type == "Text Content":
+        for p in soup.find_all('p'):
+            text = p.text.strip()
+            items.append((text, text))
+    elif data_type == "Images":
+        for img in soup.find_all('img', src=True):
+            img_url = resolve_image_url(page_url, img['src'])
+            items.append((img_url, img_url))
+    return items
+
+def find_next_url(soup, page_url, selector=None):
+    # A user-supplied CSS selector wins; otherwise rel="next" on <link> or <a>
+    tag = soup.select_one(selector) if selector else None
+    if tag is None:
+        tag = soup.find(['link', 'a'], rel='next', href=True)
+    if tag is not None and tag.get('href'):
+        return urljoin(page_url, tag['href'])
+    return None
+
+class Scraper:
+    # The whole fetch -> extract -> report pipeline, independent of Qt so it
+    # can run inside ScraperThread or from the headless command line
+    def __init__(self, url, data_type, change_tracker=None, results_store=None, profile=None,
+                 check_links=False, fetcher=None, max_page_bytes=DEFAULT_MAX_PAGE_BYTES,
+                 max_image_bytes=DEFAULT_MAX_IMAGE_BYTES, truncate_pages=False,
+                 paginate=False, max_pages=10, next_selector=None, page_template=None,
+                 boilerplate_filter=None, recorder=None):
         self.url = url
-        self.data_type = data_type
+        self.data_type = profile.data_type if profile else data_type
+        # When set, only differences from the previous scrape are reported
+        self.change_tracker = change_tracker
+        self.results_store = results_store
+        self.profile = profile
+        self.check_links = check_links
+        # Retries with backoff and a per-host circuit breaker; share one
+        # fetcher between scrapes so the breaker remembers dead hosts
+        self.fetcher = fetcher or Fetcher()
+        self.max_page_bytes = max_page_bytes
+        self.max_image_bytes = max_image_bytes
+        # Parse the first max_page_bytes of an oversize page instead of failing
+        self.truncate_pages = truncate_pages
+        # Follow next-page links (rel=next, next_selector) or a URL template
+        # with a {page} placeholder, up to max_pages
+        self.paginate = paginate
+        self.max_pages = max_pages
+        self.next_selector = next_selector
+        self.page_template = page_template
+        # Shared across scrapes so repeated nav/footer text is learned per host
+        self.boilerplate_filter = boilerplate_filter
+        # WarcWriter that every fetched page and image is archived to; pass a
+        # warc.ReplayFetcher as fetcher to serve an archive instead of the network
+        self.recorder = recorder
+        self.failed_images = 0
+        self.oversized_images = 0
 
     def download_image(self, img_url):
         try:
-            response = requests.get(img_url)
-            response.raise_for_status()
-            return response.content
-        except:
+            response = self.fetcher.get(img_url, stream=True)
+            if not response.ok:
+                response.close()
+                self.failed_images += 1
+                return None
+            body, _ = read_body(response, self.max_image_bytes)
+            if self.recorder:
+                self.recorder.record(img_url, response, body)
+            return body
+        except ResponseTooLarge:
+            self.oversized_images += 1
+            return None
+        except requests.RequestException:
+            self.failed_images += 1
             return None
 
-    def run(self):
+    def check_page_links(self, soup, page_url, on_link_checked=None):
+        if self.fetcher.offline:
+            return "(Link check skipped: replaying from an archive stays off the network)"
+        urls = collect_links(page_url, [a['href'] for a in soup.find_all('a', href=True)])
+        checker = LinkChecker()
         try:
-            response = requests.get(self.url)
+            callback = (lambda r: on_link_checked(format_link_result(r))) if on_link_checked else None
+            results = checker.check(urls, callback)
+        finally:
+            checker.close()
+        return summarize(results) + "\n\n" + "\n".join(format_link_result(r) for r in results)
+
+    def run(self, on_images=None, on_link_checked=None, on_page=None):
+        with metrics.IN_FLIGHT.track(), PeakRssSampler() as rss:
+            try:
+                with metrics.PHASE_SECONDS.time(phase='total'):
+                    result = self.scrape(on_images, on_link_checked, on_page)
+            except Exception:
+                metrics.SCRAPES.inc(outcome='error')
+                raise
+            metrics.SCRAPES.inc(outcome='ok')
+        if rss.peak:
+            result += f"\n\nPeak RSS: {format_bytes(rss.peak)}"
+        return result
+
+    def scrape(self, on_images=None, on_link_checked=None, on_page=None):
+        stats_before = self.fetcher.snapshot()
+        image_data_list = []
+        if self.paginate:
+            result = self.scrape_pages(image_data_list, on_link_checked, on_page)
+        else:
+            result = self.scrape_page(self.url, self.fetch_page(self.url), image_data_list, on_link_checked)
+
+        if image_data_list and on_images:
+            on_images(image_data_list)
+        stats = format_stats(stats_before, self.fetcher.snapshot(), self.failed_images, self.oversized_images)
+        if stats:
+            result += "\n\n" + stats
+        return result
+
+    def fetch_page(self, url, conditional=True):
+        # Returns (response, body, truncated); body is None when the server says 304
+        headers = {}
+        if self.change_tracker and conditional:
+            headers = self.change_tracker.conditional_headers(url, self.data_type)
+        with metrics.PHASE_SECONDS.time(phase='fetch'):
+            response = self.fetcher.get(url, headers=headers, stream=True)
+            if headers:
+                metrics.CACHE_LOOKUPS.inc(cache='conditional_get',
+                                          result='hit' if response.status_code == 304 else 'miss')
+            if response.status_code == 304:
+                response.close()
+                return response, None, False
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'lxml')
-            
-            result = ""
-            if self.data_type == "Headings":
-                headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                if not headings:
-                    self.error.emit("No headings found on the page")
-                    return
-                
-                heading_texts = []
-                for h in headings:
-                    level = int(h.name[1])  # Get heading level (1-6)
-                    indent = "  " * (level - 1)  # Indent based on heading level
-                    text = h.text.strip()
-                    if text:  # Only include non-empty headings
-                        heading_texts.append(f"{indent}[H{level}] {text}")
-                
-                if heading_texts:
-                    result = "\n".join(heading_texts)
-                else:
-                    self.error.emit("No non-empty headings found on the page")
-                    return
-            elif self.data_type == "Links":
-                links = soup.find_all('a', href=True)
-                result = "\n".join([f"{link.text.strip()} - {link['href']}" 
-                                  for link in links if link.text.strip()])
-            elif self.data_type == "Text Content":
-                paragraphs = soup.find_all('p')
-                result = "\n\n".join([p.text.strip() for p in paragraphs])
-            elif self.data_type == "Images":
-                images = soup.find_all('img', src=True)
-                image_data_list = []
-                
-                for img in images:
-                    img_url = img['src']
-                    if not img_url.startswith(('http://', 'https://')):
-                        # Handle relative URLs
-                        if img_url.startswith('/'):
-                            base_url = '/'.join(self.url.split('/')[:3])
-                            img_url = base_url + img_url
-                        else:
-                            img_url = self.url.rstrip('/') + '/' + img_url
-                    
+            body, truncated = read_body(response, self.max_page_bytes, self.truncate_pages)
+        if self.recorder:
+            self.recorder.record(url, response, body, truncated)
+        return response, body, truncated
+
+    def parse(self, response, body):
+        with metrics.PHASE_SECONDS.time(phase='parse'):
+            # Only trust the declared encoding; otherwise let the parser sniff <meta charset>
+            declared = 'charset' in response.headers.get('Content-Type', '').lower()
+            return BeautifulSoup(body, 'lxml', from_encoding=response.encoding if declared else None)
+
+    def scrape_pages(self, image_data_list, on_link_checked=None, on_page=None):
+        # The fetch of page N+1 runs in the background while page N is
+        # extracted, so a long listing costs roughly its download time
+        sections = []
+        url = self.url
+        visited = {url}
+        # A 304 has no body to find the next link in, so only the URL
+        # template mode can use conditional requests
+        conditional = bool(self.page_template)
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(self.fetch_page, url, conditional)
+            for page in range(1, self.max_pages + 1):
+                header = f"=== Page {page}: {url} ==="
+                try:
+                    fetched = pending.result()
+                except requests.RequestException as e:
+                    if page == 1:
+                        raise
+                    sections.append(f"{header}\n\nStopped following pages: {str(e)}")
+                    break
+
+                response, body, _ = fetched
+                soup = None
+                next_url = None
+                if self.page_template:
+                    next_url = self.page_template.replace('{page}', str(page + 1))
+                elif body is not None:
+                    soup = self.parse(response, body)
+                    next_url = find_next_url(soup, response.url, self.next_selector)
+                if page == self.max_pages or next_url in visited:
+                    next_url = None
+                if next_url:
+                    visited.add(next_url)
+                    pending = prefetcher.submit(self.fetch_page, next_url, conditional)
+
+                try:
+                    text = self.scrape_page(url, fetched, image_data_list, on_link_checked, soup)
+                except ScrapeError as e:
+                    text = f"Error: {str(e)}"
+                section = f"{header}\n\n{text}"
+                sections.append(section)
+                if on_page:
+                    on_page(section)
+                if not next_url:
+                    break
+                url = next_url
+        return "\n\n".join(sections)
+
+    def scrape_page(self, url, fetched, image_data_list, on_link_checked=None, soup=None):
+        response, body, truncated = fetched
+        if body is None:
+            return "No changes since last scrape (not modified)"
+
+        if self.profile:
+            with metrics.PHASE_SECONDS.time(phase='extract'):
+                try:
+                    items = self.profile.extract(body, url)
+                except ProfileError as e:
+                    raise ScrapeError(str(e))
+            if not items:
+                raise ScrapeError(f"No selector of profile '{self.profile.name}' matched on the page")
+        else:
+            if soup is None:
+                soup = self.parse(response, body)
+            with metrics.PHASE_SECONDS.time(phase='extract'):
+                items = extract_items(soup, self.data_type, url)
+            if self.data_type == "Headings" and not items:
+                if soup.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+                    raise ScrapeError("No non-empty headings found on the page")
+                raise ScrapeError("No headings found on the page")
+
+        dropped = 0
+        if self.boilerplate_filter and self.data_type == "Text Content":
+            items, dropped = self.boilerplate_filter.filter(url, items)
+
+        store_error = None
+        if self.results_store:
+            try:
+                with metrics.PHASE_SECONDS.time(phase='store'):
+                    self.results_store.add_scrape(url, self.data_type, [line for _, line in items])
+            except sqlite3.Error as e:
+                metrics.ERRORS.inc(type='store')
+                store_error = str(e)
+
+        diff = None
+        if self.change_tracker:
+            diff = self.change_tracker.diff(url, self.data_type, items)
+            self.change_tracker.update_validators(url, self.data_type, response.headers)
+            if diff is not None and self.data_type == "Images":
+                # Only download images that weren't there last time
+                added = set(diff[0])
+                items = [(key, line) for key, line in items if line in added]
+
+        if self.data_type == "Images":
+            found = 0
+            failed = []
+            metrics.QUEUE_DEPTH.set(len(items), queue='images')
+            with metrics.PHASE_SECONDS.time(phase='images'):
+                for img_url, _ in items:
                     img_data = self.download_image(img_url)
+                    metrics.QUEUE_DEPTH.dec(queue='images')
                     if img_data:
                         image_data_list.append((img_url, img_data))
-                
-                if image_data_list:
-                    self.images_found.emit(image_data_list)
-                result = f"Found {len(image_data_list)} images"
-            
+                        found += 1
+                    else:
+                        failed.append(img_url)
+            if self.change_tracker and failed:
+                self.change_tracker.forget(url, self.data_type, failed)
+            result = f"Found {found} images"
+            if diff is not None:
+                result = format_diff(*diff) + "\n\n" + result
+        elif diff is not None:
+            result = format_diff(*diff)
+        elif self.data_type == "Text Content":
+            result = "\n\n".join(line for _, line in items)
+        else:
+            result = "\n".join(line for _, line in items)
+        if self.change_tracker:
+            self.change_tracker.save()  # after downloads, so failed images aren't marked as seen
+
+        if self.check_links and self.data_type == "Links":
+            with metrics.PHASE_SECONDS.time(phase='link_check'):
+                result += "\n\n" + self.check_page_links(soup, response.url, on_link_checked)
+
+        if dropped:
+            result += f"\n\n(Dropped {dropped} paragraphs repeated across pages of this site)"
+        if truncated:
+            result += f"\n\n(Page is larger than {format_bytes(self.max_page_bytes)}; only the first part was parsed)"
+        if store_error:
+            result += f"\n\n(Results were not saved to history: {store_error})"
+        return result
+
+class ScraperThread(QThread):
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+    images_found = pyqtSignal(list)  # Changed to emit list of tuples (url, data)
+    link_checked = pyqtSignal(str)  # One line per link as its probe completes
+    page_scraped = pyqtSignal(str)  # One section per page when following pages
+
+    def __init__(self, url, data_type, **options):
+        super().__init__()
+        self.scraper = Scraper(url, data_type, **options)
+
+    def run(self):
+        try:
+            result = self.scraper.run(self.images_found.emit, self.link_checked.emit,
+                                      self.page_scraped.emit)
             self.finished.emit(result)
         except Exception as e:
             self.error.emit(str(e))
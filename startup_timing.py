@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Runs in a fresh interpreter for every sample so imports are really cold
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QEvent, QTimer
+
+app = QApplication(sys.argv[:1])
+timings = {'qt_ready': time.perf_counter() - start}
+if sys.argv[1] == 'eager':
+    # What startup used to pay before scraping modules were loaded lazily
+    import scraper, fetcher, warc, results_store, change_tracker, metrics
+    import lxml.html, lxml.cssselect
+from app import WebScraperApp
+timings['import_app'] = time.perf_counter() - start
+window = WebScraperApp()
+timings['construct'] = time.perf_counter() - start
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and 'first_paint' not in timings:
+            timings['first_paint'] = time.perf_counter() - start
+            timings['first_paint_wall'] = time.time()
+            QTimer.singleShot(0, app.quit)
+        return False
+
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+window.show()
+QTimer.singleShot(10000, app.quit)  # never hang if nothing gets painted
+app.exec()
+
+switch_start = time.perf_counter()
+for _ in range(3):
+    for theme in ["Dark", "Nord", "Solarized", "Dracula", "Light"]:
+        window.apply_theme(theme)
+timings['theme_switch_x15'] = time.perf_counter() - switch_start
+print(json.dumps(timings))
+'''
+
+def run_once(mode):
+    spawned = time.time()
+    output = subprocess.run([sys.executable, '-c', CHILD, mode], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    if 'first_paint_wall' in timings:
+        # Includes interpreter start-up, which perf_counter in the child can't see
+        timings['spawn_to_first_paint'] = timings.pop('first_paint_wall') - spawned
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-first-paint of the main window.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--eager", action="store_true",
+                        help="also import the network/parsing modules up front, like startup used to")
+    args = parser.parse_args()
+
+    modes = ['lazy', 'eager'] if args.eager else ['lazy']
+    for mode in modes:
+        samples = [run_once(mode) for _ in range(args.runs)]
+        print(f"{mode} startup, median of {args.runs} runs:")
+        for key in samples[0]:
+            values = [s[key] for s in samples if key in s]
+            print(f"  {key:<22} {statistics.median(values) * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
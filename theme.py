@@ -1,6 +1,139 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QLabel, QComboBox, QPushButton, QFrame)
 from PyQt6.QtCore import QSettings, Qt
 from PyQt6.QtGui import QFont
+from functools import lru_cache
+
+BASE_STYLES = """
+    QMainWindow, QWidget {
+        font-family: 'Segoe UI', sans-serif;
+    }
+    QLabel {
+        padding: 5px;
+    }
+    QComboBox {
+        padding: 8px;
+        border-radius: 5px;
+        min-width: 200px;
+    }
+    QPushButton {
+        padding: 10px 20px;
+        border-radius: 5px;
+        font-weight: bold;
+    }
+    QFrame[frameShape="4"] {
+        margin: 10px 0;
+    }
+"""
+
+THEME_STYLES = {
+    "Light": """
+        QMainWindow, QWidget {
+            background-color: #ffffff;
+            color: #333333;
+        }
+        QComboBox {
+            background-color: white;
+            border: 1px solid #dddddd;
+            color: #333333;
+        }
+        QPushButton {
+            background-color: #0078d4;
+            color: white;
+            border: none;
+        }
+        QFrame[frameShape="4"] {
+            color: #dddddd;
+        }
+    """,
+    "Dark": """
+        QMainWindow, QWidget {
+            background-color: #1a1a1a;
+            color: #ffffff;
+        }
+        QComboBox {
+            background-color: #2d2d2d;
+            border: 1px solid #404040;
+            color: #ffffff;
+        }
+        QPushButton {
+            background-color: #0078d4;
+            color: white;
+            border: none;
+        }
+        QFrame[frameShape="4"] {
+            color: #404040;
+        }
+    """,
+    "Nord": """
+        QMainWindow, QWidget {
+            background-color: #2e3440;
+            color: #eceff4;
+        }
+        QComboBox {
+            background-color: #3b4252;
+            border: 1px solid #4c566a;
+            color: #eceff4;
+        }
+        QPushButton {
+            background-color: #88c0d0;
+            color: #2e3440;
+            border: none;
+        }
+        QFrame[frameShape="4"] {
+            color: #4c566a;
+        }
+    """,
+    "Solarized": """
+        QMainWindow, QWidget {
+            background-color: #002b36;
+            color: #839496;
+        }
+        QComboBox {
+            background-color: #073642;
+            border: 1px solid #586e75;
+            color: #839496;
+        }
+        QPushButton {
+            background-color: #268bd2;
+            color: #002b36;
+            border: none;
+        }
+        QFrame[frameShape="4"] {
+            color: #586e75;
+        }
+    """,
+    "Dracula": """
+        QMainWindow, QWidget {
+            background-color: #282a36;
+            color: #f8f8f2;
+        }
+        QComboBox {
+            background-color: #3f3f3f;
+            border: 1px solid #44475a;
+            color: #f8f8f2;
+        }
+        QPushButton {
+            background-color: #bd93f9;
+            color: #282a36;
+            border: none;
+        }
+        QFrame[frameShape="4"] {
+            color: #44475a;
+        }
+    """,
+}
+
+@lru_cache(maxsize=None)
+def join_styles(base, styles):
+    # styles is one stylesheet or a tuple of them; both are hashable, so
+    # each window/theme pair is only concatenated once
+    if isinstance(styles, str):
+        styles = (styles,)
+    return base + "".join(styles)
+
+def theme_stylesheet(theme, base=BASE_STYLES, table=THEME_STYLES):
+    # The main window passes its own tables; unknown names fall back to Light
+    return join_styles(base, table.get(theme, table["Light"]))
 
 class ThemeWindow(QMainWindow):
     def __init__(self, main_app):
@@ -9,6 +142,7 @@ class ThemeWindow(QMainWindow):
         self.setWindowTitle("Theme Customization")
         self.setMinimumSize(400, 300)
         self.settings = QSettings('ScrapApp', 'WebScraper')
+        self.current_theme = None
         self.setup_ui()
         self.apply_theme(self.settings.value('theme', 'Light'))
 
@@ -58,125 +192,7 @@ class ThemeWindow(QMainWindow):
         self.apply_theme(theme)
 
     def apply_theme(self, theme):
-        base_styles = """
-            QMainWindow, QWidget {
-                font-family: 'Segoe UI', sans-serif;
-            }
-            QLabel {
-                padding: 5px;
-            }
-            QComboBox {
-                padding: 8px;
-                border-radius: 5px;
-                min-width: 200px;
-            }
-            QPushButton {
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QFrame[frameShape="4"] {
-                margin: 10px 0;
-            }
-        """
-
-        if theme == "Dark":
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #1a1a1a;
-                    color: #ffffff;
-                }
-                QComboBox {
-                    background-color: #2d2d2d;
-                    border: 1px solid #404040;
-                    color: #ffffff;
-                }
-                QPushButton {
-                    background-color: #0078d4;
-                    color: white;
-                    border: none;
-                }
-                QFrame[frameShape="4"] {
-                    color: #404040;
-                }
-            """)
-        elif theme == "Nord":
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #2e3440;
-                    color: #eceff4;
-                }
-                QComboBox {
-                    background-color: #3b4252;
-                    border: 1px solid #4c566a;
-                    color: #eceff4;
-                }
-                QPushButton {
-                    background-color: #88c0d0;
-                    color: #2e3440;
-                    border: none;
-                }
-                QFrame[frameShape="4"] {
-                    color: #4c566a;
-                }
-            """)
-        elif theme == "Solarized":
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #002b36;
-                    color: #839496;
-                }
-                QComboBox {
-                    background-color: #073642;
-                    border: 1px solid #586e75;
-                    color: #839496;
-                }
-                QPushButton {
-                    background-color: #268bd2;
-                    color: #002b36;
-                    border: none;
-                }
-                QFrame[frameShape="4"] {
-                    color: #586e75;
-                }
-            """)
-        elif theme == "Dracula":
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #282a36;
-                    color: #f8f8f2;
-                }
-                QComboBox {
-                    background-color: #3f3f3f;
-                    border: 1px solid #44475a;
-                    color: #f8f8f2;
-                }
-                QPushButton {
-                    background-color: #bd93f9;
-                    color: #282a36;
-                    border: none;
-                }
-                QFrame[frameShape="4"] {
-                    color: #44475a;
-                }
-            """)
-        else:  # Light
-            self.setStyleSheet(base_styles + """
-                QMainWindow, QWidget {
-                    background-color: #ffffff;
-                    color: #333333;
-                }
-                QComboBox {
-                    background-color: white;
-                    border: 1px solid #dddddd;
-                    color: #333333;
-                }
-                QPushButton {
-                    background-color: #0078d4;
-                    color: white;
-                    border: none;
-                }
-                QFrame[frameShape="4"] {
-                    color: #dddddd;
-                }
-            """)
+        if theme == self.current_theme:
+            return
+        self.current_theme = theme
+        self.setStyleSheet(theme_stylesheet(theme))
@@ -0,0 +1,185 @@
+import gzip
+import json
+import mmap
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from fetcher import Fetcher
+
+# Bodies are stored decoded, so these no longer describe them
+DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+def index_path(warc_path):
+    return warc_path + '.idx'
+
+def warc_record(warc_type, target_uri, content_type, block, extra_headers=()):
+    headers = [
+        ("WARC-Type", warc_type),
+        ("WARC-Record-ID", f"<urn:uuid:{uuid.uuid4()}>"),
+        ("WARC-Date", datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')),
+    ]
+    if target_uri:
+        headers.append(("WARC-Target-URI", target_uri))
+    headers += list(extra_headers)
+    headers += [("Content-Type", content_type), ("Content-Length", str(len(block)))]
+    head = "WARC/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers) + "\r\n"
+    return head.encode('utf-8') + block + b"\r\n\r\n"
+
+class WarcWriter:
+    # Appends one gzip member per record, so any record can be decompressed
+    # on its own from its offset; offsets go to a JSON-lines sidecar index
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file and not os.path.exists(index_path(path)):
+            # Appending to a partial index would hide the records already there
+            build_index(path)
+        self.file = open(path, 'ab')
+        self.index = open(index_path(path), 'a', encoding='utf-8')
+        if new_file:
+            info = b"software: Modern Web Scraper\r\nformat: WARC File Format 1.1\r\n"
+            self.write(warc_record("warcinfo", None, "application/warc-fields", info))
+
+    def write(self, record, urls=()):
+        data = gzip.compress(record)
+        with self.lock:
+            offset = self.file.tell()
+            self.file.write(data)
+            self.file.flush()
+            for url in urls:
+                self.index.write(json.dumps([url, offset, len(data)]) + "\n")
+            self.index.flush()
+
+    def record(self, requested_url, response, body, truncated=False):
+        status_line = f"HTTP/1.1 {response.status_code} {response.reason or ''}".rstrip()
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS]
+        headers.append(("Content-Length", str(len(body))))
+        http_head = status_line + "\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers) + "\r\n"
+        block = http_head.encode('iso-8859-1', errors='replace') + body
+        extra = [("WARC-Truncated", "length")] if truncated else []
+        record = warc_record("response", response.url, "application/http; msgtype=response", block, extra)
+        urls = [requested_url] if requested_url == response.url else [requested_url, response.url]
+        self.write(record, urls)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+            self.index.close()
+
+def parse_record(data):
+    # Returns (warc_headers, block) for one uncompressed record
+    head, _, rest = data.partition(b"\r\n\r\n")
+    lines = head.decode('utf-8', errors='replace').split("\r\n")
+    headers = CaseInsensitiveDict()
+    for line in lines[1:]:
+        key, _, value = line.partition(":")
+        headers[key.strip()] = value.strip()
+    length = int(headers.get('Content-Length', len(rest)))
+    return headers, rest[:length]
+
+def build_index(path):
+    # One streaming pass over the gzip members, only needed for archives
+    # written without a sidecar index
+    entries = []
+    size = os.path.getsize(path)
+    offset = 0
+    with open(path, 'rb') as f:
+        while offset < size:
+            f.seek(offset)
+            decompressor = zlib.decompressobj(wbits=31)
+            head = b""
+            consumed = 0
+            while not decompressor.eof:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                consumed += len(chunk)
+                try:
+                    output = decompressor.decompress(chunk)
+                except zlib.error:
+                    raise ValueError(f"{os.path.basename(path)} is not a gzipped WARC file")
+                if len(head) < 16 * 1024:
+                    head += output[:16 * 1024]
+            if not decompressor.eof:
+                break  # truncated last record
+            length = consumed - len(decompressor.unused_data)
+            headers, _ = parse_record(head)
+            if headers.get('WARC-Type') == 'response' and headers.get('WARC-Target-URI'):
+                entries.append([headers['WARC-Target-URI'], offset, length])
+            offset += length
+    with open(index_path(path), 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return entries
+
+class WarcArchive:
+    # Random access to recorded responses through the offset index and an
+    # mmap of the archive; nothing is scanned at lookup time
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(index_path(path)):
+            with open(index_path(path), 'r', encoding='utf-8') as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            entries = build_index(path)
+        self.offsets = {url: (offset, length) for url, offset, length in entries}  # latest wins
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b""
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def response(self, url):
+        if url not in self.offsets:
+            return None
+        offset, length = self.offsets[url]
+        try:
+            data = gzip.decompress(self.map[offset:offset + length])
+        except (OSError, EOFError, zlib.error):
+            raise ValueError(f"{os.path.basename(self.path)} is not a gzipped WARC file")
+        warc_headers, block = parse_record(data)
+        http_head, _, body = block.partition(b"\r\n\r\n")
+        lines = http_head.decode('iso-8859-1').split("\r\n")
+        parts = lines[0].split(" ", 2)
+
+        response = requests.Response()
+        response.status_code = int(parts[1])
+        response.reason = parts[2] if len(parts) > 2 else ""
+        response.headers = CaseInsensitiveDict()
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            response.headers[key.strip()] = value.strip()
+        response.url = warc_headers.get('WARC-Target-URI', url)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True  # lets iter_content() serve _content
+        return response
+
+    def close(self):
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
+
+class ReplayFetcher(Fetcher):
+    # Drop-in for Fetcher that serves every request from a WARC archive
+    offline = True
+
+    def __init__(self, archive):
+        super().__init__(retries=0)
+        self.archive = archive
+
+    def prewarm(self, url):
+        return False
+
+    def get(self, url, **kwargs):
+        self.count('requests')
+        response = self.archive.response(url)
+        if response is None:
+            raise requests.ConnectionError(f"{url} is not in the archive {os.path.basename(self.archive.path)}")
+        return response